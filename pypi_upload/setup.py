@@ -26,6 +26,9 @@ setup(
     version=get_version(),
     packages=find_packages(include=('smart_fruit', 'smart_fruit.*')),
     install_requires=get_requirements(),
+    entry_points={
+        'console_scripts': ['smart_fruit = smart_fruit.cli:main']
+    },
 
     author='Robert Wright',
     author_email='madman.bob@hotmail.co.uk',
@@ -1,5 +1,6 @@
 from smart_fruit.model import Model
+from smart_fruit.feature_store import FeatureStore
 
 __version__ = '1.2.1'
 
-__all__ = ["Model"]
+__all__ = ["Model", "FeatureStore"]
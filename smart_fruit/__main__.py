@@ -0,0 +1,3 @@
+from smart_fruit.cli import main
+
+main()
@@ -0,0 +1,240 @@
+"""
+Command line interface, to train, score, and predict with a model, streaming CSV, or JSON lines, files
+
+eg.
+
+    smart_fruit train examples.iris:Iris iris_data.csv iris.pickle
+    smart_fruit score examples.iris:Iris iris.pickle iris_data.csv
+    smart_fruit predict examples.iris:Iris iris.pickle iris_data.csv --output predictions.jsonl
+"""
+
+from argparse import ArgumentParser
+from csv import writer as csv_writer
+from importlib import import_module
+from io import TextIOWrapper
+from json import dumps as json_dumps, loads as json_loads
+from pickle import dump as pickle_dump, load as pickle_load
+import sys
+from time import monotonic
+
+from smart_fruit.metrics import R2Score
+from smart_fruit.utils import chunks, csv_paths, open_decompressed
+
+__all__ = ["main"]
+
+_compression_extensions = ('.gz', '.bz2', '.xz', '.zst')
+_json_lines_extensions = ('.jsonl', '.ndjson')
+
+
+def load_schema(schema_path):
+    """
+    The model class given by a path of the form module.path:ClassName
+    """
+
+    module_path, _, class_name = schema_path.partition(':')
+
+    if not class_name:
+        raise ValueError(
+            "Schema must be given as module.path:ClassName (given {!r})".format(schema_path)
+        )
+
+    return getattr(import_module(module_path), class_name)
+
+
+def _is_json_lines(path):
+    for extension in _compression_extensions:
+        if path.endswith(extension):
+            path = path[:-len(extension)]
+
+    return path.endswith(_json_lines_extensions)
+
+
+def _json_lines(paths):
+    for path in paths:
+        with TextIOWrapper(open_decompressed(path), encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json_loads(line)
+
+
+def _read_features(schema, data_path, input_only, workers):
+    if _is_json_lines(data_path):
+        json = _json_lines(csv_paths(data_path))
+
+        return schema.input_features_from_json(json) if input_only else schema.features_from_json(json)
+
+    if input_only:
+        return schema.input_features_from_csv(data_path, workers=workers)
+
+    return schema.features_from_csv(data_path, workers=workers)
+
+
+def _report_progress(iterable, verb, interval=1):
+    """
+    Yields the items of iterable, reporting the number of items, and items per second, to stderr as it goes
+    """
+
+    start = last_report = monotonic()
+    count = 0
+
+    def report(end='\r'):
+        elapsed = monotonic() - start
+        print(
+            "{} {} rows ({:.0f} rows/s)".format(verb, count, count / elapsed if elapsed else 0),
+            end=end,
+            file=sys.stderr,
+            flush=True
+        )
+
+    for item in iterable:
+        yield item
+
+        count += 1
+
+        if monotonic() - last_report >= interval:
+            report()
+            last_report = monotonic()
+
+    report(end='\n')
+
+
+def _load_model(schema, model_path):
+    with open(model_path, 'rb') as model_file:
+        model = pickle_load(model_file)
+
+    if not isinstance(model, schema):
+        raise TypeError(
+            "Model at {!r} is not a {}".format(model_path, schema.__name__)
+        )
+
+    return model
+
+
+def train(args):
+    schema = load_schema(args.schema)
+
+    features = _report_progress(_read_features(schema, args.data, False, args.workers), "Read")
+
+    # Only the default LinearRegression model, of few enough input columns, may be trained without holding all
+    # features in memory
+    chunk_size = args.batch_size if schema._can_train_in_chunks(schema().model) else None
+
+    model = schema.train(features, chunk_size=chunk_size)
+
+    with open(args.model, 'wb') as model_file:
+        pickle_dump(model, model_file)
+
+
+def score(args):
+    schema = load_schema(args.schema)
+    model = _load_model(schema, args.model)
+
+    features = _report_progress(_read_features(schema, args.data, False, args.workers), "Scored")
+
+    # Regression models may be scored without holding all features in memory
+    chunk_size = args.batch_size if R2Score.can_score(model.model) else None
+
+    print(model.score(features, chunk_size=chunk_size))
+
+
+def _json_default(value):
+    # Complex values are written as [real, imag], and numpy values as the equivalent lists, or numbers
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+
+    return value.tolist()
+
+
+def _write_predictions(predictions, output_file, json_lines, fields):
+    if json_lines:
+        for row in predictions:
+            output_file.write(json_dumps(dict(zip(fields, row)), default=_json_default) + '\n')
+    else:
+        writer = csv_writer(output_file)
+        writer.writerow(fields)
+        writer.writerows(predictions)
+
+
+def predict(args):
+    schema = load_schema(args.schema)
+    model = _load_model(schema, args.model)
+
+    input_features = _report_progress(_read_features(schema, args.data, True, args.workers), "Predicted")
+
+    fields = schema.Output._fields
+
+    if args.yield_inputs:
+        fields = schema.Input._fields + fields
+
+    def predictions():
+        for batch in chunks(input_features, args.batch_size):
+            if args.yield_inputs:
+                for input_, output in model.predict(batch, yield_inputs=True):
+                    yield input_ + output
+            else:
+                yield from model.predict(batch)
+
+    if args.output is None:
+        _write_predictions(predictions(), sys.stdout, False, fields)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as output_file:
+            _write_predictions(predictions(), output_file, _is_json_lines(args.output), fields)
+
+
+def _parser():
+    parser = ArgumentParser(prog='smart_fruit', description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    def add_subparser(name, func, help_, model_help):
+        subparser = subparsers.add_parser(name, help=help_)
+        subparser.set_defaults(func=func)
+
+        subparser.add_argument('schema', help="Model class, as module.path:ClassName")
+
+        if name == 'train':
+            subparser.add_argument('data', help="CSV, or JSON lines, file of features, or glob pattern of files")
+            subparser.add_argument('model', help=model_help)
+        else:
+            subparser.add_argument('model', help=model_help)
+            subparser.add_argument('data', help="CSV, or JSON lines, file of features, or glob pattern of files")
+
+        subparser.add_argument(
+            '--workers',
+            type=int,
+            help="Number of processes to read CSV files in"
+        )
+        subparser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help="Number of features to hold in memory at once (default: %(default)s)"
+        )
+
+        return subparser
+
+    add_subparser('train', train, "Train a model", "Path to save the trained model to")
+    add_subparser('score', score, "Score a trained model", "Path of the trained model")
+
+    predict_parser = add_subparser(
+        'predict',
+        predict,
+        "Predict outputs with a trained model",
+        "Path of the trained model"
+    )
+    predict_parser.add_argument(
+        '--output',
+        help="CSV, or JSON lines, file to write the predictions to (default: CSV to stdout)"
+    )
+    predict_parser.add_argument(
+        '--yield-inputs',
+        action='store_true',
+        help="Write the inputs alongside the predictions"
+    )
+
+    return parser
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+    args.func(args)
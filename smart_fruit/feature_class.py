@@ -1,6 +1,6 @@
 from collections import namedtuple
 
-from smart_fruit.feature_types import FeatureType
+from smart_fruit.feature_types import FeatureType, Optional
 
 __all__ = ["FeatureClassMeta"]
 
@@ -15,9 +15,17 @@ class FeatureClassMixin:
     @classmethod
     def from_json(cls, json):
         return cls(**{
-            key: value
-            for key, value in json.items()
-            if key in cls._fields
+            # Optional features may be left out
+            **{
+                name: None
+                for name, feature_type in zip(cls._fields, cls)
+                if isinstance(feature_type, Optional)
+            },
+            **{
+                key: value
+                for key, value in json.items()
+                if key in cls._fields
+            }
         })
 
     def to_json(self):
@@ -33,13 +41,22 @@ class FeatureClassMeta(type):
             if isinstance(value, FeatureType)
         )
 
-        return type.__new__(
+        feature_class = type.__new__(
             cls,
             name,
             tuple(bases) + (namedtuple(base_feature_type.__name__, features), FeatureClassMixin,),
             namespace
         )
 
+        # Features with no encoded columns, such as Tags, are kept out of the encoding entirely
+        feature_class._encoded_features = tuple(
+            (i, feature_type)
+            for i, feature_type in enumerate(feature_class)
+            if feature_type.feature_count
+        )
+
+        return feature_class
+
     def __iter__(self):
         for field_name in self._fields:
             yield getattr(self, field_name)
@@ -0,0 +1,200 @@
+from json import dump as json_dump, load as json_load
+from os import makedirs, path
+from struct import pack
+
+from numpy import ascontiguousarray, dtype as numpy_dtype, float64, load
+from numpy.lib.format import magic
+
+from smart_fruit.statistics import ColumnStatistics
+from smart_fruit.utils import chunks
+
+__all__ = ["FeatureStore"]
+
+
+class _ArrayWriter:
+    """
+    Writes a 2D array to a .npy file one block of rows at a time
+
+    The header is reserved up front, and rewritten with the final row count on close,
+    so the total number of rows need not be known in advance.
+    """
+
+    header_size = 128
+
+    def __init__(self, file_path, column_count, dtype=float64):
+        self.file = open(file_path, 'wb')
+        self.column_count = column_count
+        self.dtype = numpy_dtype(dtype)
+        self.row_count = 0
+
+        self._write_header()
+
+    def _write_header(self):
+        prefix = magic(1, 0)
+
+        header = repr({
+            'descr': self.dtype.str,
+            'fortran_order': False,
+            'shape': (self.row_count, self.column_count)
+        })
+        header = header.ljust(self.header_size - len(prefix) - 3) + '\n'
+
+        self.file.write(prefix + pack('<H', len(header)) + header.encode('latin1'))
+
+    def write(self, block):
+        block = ascontiguousarray(block, dtype=self.dtype)
+
+        if block.ndim != 2 or block.shape[1] != self.column_count:
+            raise ValueError(
+                "Incorrect block shape (expected (n, {}), got {!r})".format(self.column_count, block.shape)
+            )
+
+        self.file.write(block.tobytes())
+        self.row_count += block.shape[0]
+
+    def close(self):
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+
+
+class FeatureStore:
+    """
+    Encoded input/output features, stored on disk as memory-mapped numpy arrays
+
+    The store is a directory, containing:
+        input.npy - Encoded input features
+        output.npy - Encoded output features
+        layout.json - Layout of the schema the features were encoded with
+        statistics.json - Statistics used to impute, and scale, the input features
+
+    Open an existing store with FeatureStore(path), or create a new one with FeatureStore.create.
+    """
+
+    input_file_name = 'input.npy'
+    output_file_name = 'output.npy'
+    layout_file_name = 'layout.json'
+    statistics_file_name = 'statistics.json'
+
+    def __init__(self, store_path):
+        self.path = store_path
+
+        with open(path.join(store_path, self.layout_file_name), encoding='utf-8') as layout_file:
+            self.layout = json_load(layout_file)
+
+        with open(path.join(store_path, self.statistics_file_name), encoding='utf-8') as statistics_file:
+            self.input_statistics = {
+                int(i): ColumnStatistics.from_json(statistics_json)
+                for i, statistics_json in json_load(statistics_file).items()
+            }
+
+        self.input_array = load(path.join(store_path, self.input_file_name), mmap_mode='r')
+        self.output_array = load(path.join(store_path, self.output_file_name), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.input_array)
+
+    @classmethod
+    def create(cls, store_path, model_class, features, chunk_size=10000, model=None):
+        """
+        Encode an iterable of input/output pairs into a new store, in a single pass
+
+        Parameters:
+            store_path - Directory to create the store in
+            model_class - Model class whose schema to encode the features with
+            features - Iterable of input/output pairs
+            chunk_size - Number of features to hold in memory at once
+            model - Trained model whose statistics to impute, and scale, the input features with
+                If not given, learn the statistics from these features
+                Give this when creating a store of test features
+
+        Stores are dense, so features of sparse types, such as Text, or HashedLabel, may not be stored.
+        """
+
+        sparse_names = [
+            name
+            for feature_class in (model_class.Input, model_class.Output)
+            for name, feature_type in zip(feature_class._fields, feature_class)
+            if feature_type.sparse
+        ]
+
+        if sparse_names:
+            raise TypeError(
+                "May not store sparse features {} of {} (stores are dense)".format(
+                    ', '.join(sparse_names),
+                    model_class.__name__
+                )
+            )
+
+        makedirs(store_path, exist_ok=True)
+
+        layout = model_class.layout()
+
+        if model is None:
+            input_statistics = model_class._new_input_statistics()
+            input_column_slices = model_class._column_slices(model_class.Input)
+        else:
+            input_statistics = model.input_statistics
+
+        input_writer = _ArrayWriter(
+            path.join(store_path, cls.input_file_name),
+            sum(feature_count for name, type_name, feature_count in layout['input']),
+            model_class.dtype
+        )
+        output_writer = _ArrayWriter(
+            path.join(store_path, cls.output_file_name),
+            sum(feature_count for name, type_name, feature_count in layout['output']),
+            model_class.dtype
+        )
+
+        try:
+            for chunk in chunks(features, chunk_size):
+                if model is None:
+                    input_array, output_array = model_class._arrays_from_features(chunk)
+
+                    for i, field_statistics in input_statistics.items():
+                        field_statistics.update(input_array[:, input_column_slices[i]])
+                else:
+                    input_array, output_array = model_class._arrays_from_features(chunk, input_statistics)
+
+                input_writer.write(input_array)
+                output_writer.write(output_array)
+        finally:
+            input_writer.close()
+            output_writer.close()
+
+        if model is None and input_statistics:
+            # The statistics are only known once all features are written, so impute, and scale, in place
+            input_array = load(path.join(store_path, cls.input_file_name), mmap_mode='r+')
+
+            for start in range(0, len(input_array), chunk_size):
+                for i, field_statistics in input_statistics.items():
+                    field_statistics.transform(input_array[start:start + chunk_size, input_column_slices[i]])
+
+            input_array.flush()
+            del input_array
+
+        with open(path.join(store_path, cls.layout_file_name), 'w', encoding='utf-8') as layout_file:
+            json_dump(layout, layout_file)
+
+        with open(path.join(store_path, cls.statistics_file_name), 'w', encoding='utf-8') as statistics_file:
+            json_dump(cls._statistics_json(input_statistics), statistics_file)
+
+        return cls(store_path)
+
+    def check_layout(self, model_class):
+        if self.layout != model_class.layout():
+            raise ValueError(
+                "Feature store at {!r} does not match the schema of {}".format(self.path, model_class.__name__)
+            )
+
+    @staticmethod
+    def _statistics_json(input_statistics):
+        return {i: field_statistics.to_json() for i, field_statistics in input_statistics.items()}
+
+    def check_input_statistics(self, input_statistics):
+        if self._statistics_json(self.input_statistics) != self._statistics_json(input_statistics):
+            raise ValueError(
+                "Feature store at {!r} was encoded with different statistics to the model. "
+                "Create it with model=... to use the model's statistics".format(self.path)
+            )
@@ -1,5 +1,9 @@
 from smart_fruit.feature_types.feature_type_base import FeatureType
 from smart_fruit.feature_types.simple_types import Number, Integer, Complex, Label, Tag
-from smart_fruit.feature_types.compound_types import Vector
+from smart_fruit.feature_types.compound_types import Vector, Optional
+from smart_fruit.feature_types.array_types import Array
+from smart_fruit.feature_types.hashed_types import HashedLabel, Text
 
-__all__ = ["FeatureType", "Number", "Integer", "Complex", "Label", "Vector", "Tag"]
+__all__ = [
+    "FeatureType", "Number", "Integer", "Complex", "Label", "Vector", "Tag", "Array", "HashedLabel", "Text", "Optional"
+]
@@ -0,0 +1,84 @@
+from numpy import (
+    asarray, bool_, dtype as numpy_dtype, float64, floating, integer, isfinite, issubdtype, prod, rint, stack
+)
+from pandas import Series
+
+from smart_fruit.feature_types.feature_type_base import FeatureType
+from smart_fruit.utils import object_array
+
+__all__ = ["Array"]
+
+
+class Array(FeatureType):
+    """
+    A fixed-shape numpy array of real numbers
+
+    Encoded a whole batch at a time, as a single contiguous block.
+    """
+
+    def __init__(self, shape, dtype=float64):
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self.dtype = numpy_dtype(dtype)
+
+        if not any(issubdtype(self.dtype, kind) for kind in (bool_, integer, floating)):
+            raise TypeError(
+                "May not use non-real dtype {} in a {}".format(self.dtype, self.__class__.__name__)
+            )
+
+    @property
+    def feature_count(self):
+        return int(prod(self.shape))
+
+    def _check_shape(self, shape):
+        if shape != self.shape:
+            raise ValueError(
+                "Incorrect shape array (expected {}, got {})".format(self.shape, shape)
+            )
+
+    def validate(self, value):
+        value = asarray(value, dtype=float64 if issubdtype(self.dtype, integer) else self.dtype)
+
+        self._check_shape(value.shape)
+
+        if not isfinite(value).all():
+            raise ValueError(
+                "May not assign non-finite values to a {}".format(self.__class__.__name__)
+            )
+
+        if issubdtype(self.dtype, integer):
+            # Rounded, rather than truncated, as Integer features are, and as integer arrays are decoded
+            value = rint(value).astype(self.dtype)
+
+        return value
+
+    def to_series(self, value):
+        return Series(self.to_array([value])[0])
+
+    def from_series(self, features):
+        return self.from_array(features.to_numpy().reshape(1, -1))[0]
+
+    def encoded_bytes(self, dtype=None):
+        # Blocks are given in the array's own dtype, until stacked
+        return numpy_dtype(dtype or self.dtype).itemsize * self.feature_count
+
+    def to_array(self, values):
+        if not len(values):
+            return asarray(values, dtype=self.dtype).reshape(0, self.feature_count)
+
+        block = stack(values)
+
+        self._check_shape(block.shape[1:])
+
+        # Left in its own dtype, to be copied straight into the stacked features, as the model's dtype
+        return block.reshape(len(values), self.feature_count)
+
+    def from_array(self, features):
+        if issubdtype(self.dtype, bool_):
+            features = features > 0.5
+        elif issubdtype(self.dtype, integer):
+            features = rint(features)
+
+        block = features.astype(self.dtype).reshape((len(features),) + self.shape)
+
+        # Each value is a view into the same decoded block
+        return object_array(block)
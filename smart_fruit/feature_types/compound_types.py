@@ -1,8 +1,11 @@
-from pandas import concat
+from numpy import asarray, dtype as numpy_dtype, float64, full, isnan, nan
+from pandas import Series, concat
+from scipy.sparse import issparse
 
 from smart_fruit.feature_types.feature_type_base import FeatureType
+from smart_fruit.utils import hstack_features, object_array
 
-__all__ = ["Vector"]
+__all__ = ["Vector", "Optional"]
 
 
 class Vector(FeatureType):
@@ -13,22 +16,26 @@ class Vector(FeatureType):
     def feature_count(self):
         return sum(feature_type.feature_count for feature_type in self.feature_types)
 
-    def validate(self, value):
+    @property
+    def sparse(self):
+        return any(feature_type.sparse for feature_type in self.feature_types)
+
+    def _check_length(self, value):
         if len(value) != len(self.feature_types):
             raise ValueError(
                 "Incorrect length vector (expected {}, got {!r})".format(len(self.feature_types), len(value))
             )
 
+    def validate(self, value):
+        self._check_length(value)
+
         return tuple(
             feature_type.validate(subvalue)
             for subvalue, feature_type in zip(value, self.feature_types)
         )
 
     def to_series(self, value):
-        if len(value) != len(self.feature_types):
-            raise ValueError(
-                "Incorrect length vector (expected {}, got {!r})".format(len(self.feature_types), len(value))
-            )
+        self._check_length(value)
 
         return concat([
             feature_type.to_series(subvalue)
@@ -41,9 +48,197 @@ class Vector(FeatureType):
             for chunk, feature_type in self._chunk_series(features, self.feature_types)
         )
 
+    def _column_types(self, method_name):
+        types = [getattr(feature_type, method_name)() for feature_type in self.feature_types]
+
+        if not any(types):
+            return None
+
+        return [
+            type_
+            for feature_types, feature_type in zip(types, self.feature_types)
+            for type_ in (feature_types or [None] * feature_type.feature_count)
+        ]
+
+    def column_scales(self):
+        return self._column_types('column_scales')
+
+    def encoded_bytes(self, dtype=None):
+        # Element blocks are stacked as float64, unless stacked as dtype
+        return sum(
+            feature_type.encoded_bytes(dtype or float64)
+            for feature_type in self.feature_types
+        )
+
+    def column_imputes(self):
+        return self._column_types('column_imputes')
+
+    def to_array(self, values):
+        if self._overrides('to_series', Vector):
+            return super().to_array(values)
+
+        for value in values:
+            self._check_length(value)
+
+        columns = list(zip(*values)) or [()] * len(self.feature_types)
+
+        return hstack_features([
+            feature_type.to_array(column)
+            for column, feature_type in zip(columns, self.feature_types)
+        ], len(values))
+
+    def from_array(self, features):
+        if self._overrides('from_series', Vector):
+            return super().from_array(features)
+
+        columns = [
+            feature_type.from_array(chunk).tolist()
+            for chunk, feature_type in self._chunk_array(features, self.feature_types)
+        ]
+
+        return object_array(zip(*columns))
+
     @staticmethod
     def _chunk_series(series, feature_types):
         start = 0
         for feature_type in feature_types:
             yield series.iloc[start:start + feature_type.feature_count].reset_index(drop=True), feature_type
             start += feature_type.feature_count
+
+    @staticmethod
+    def _chunk_array(array, feature_types):
+        start = 0
+        for feature_type in feature_types:
+            yield array[:, start:start + feature_type.feature_count], feature_type
+            start += feature_type.feature_count
+
+
+class Optional(FeatureType):
+    """
+    A feature which may be missing
+
+    Missing values are None, NaN, or the empty string.
+    When encoding, they are filled in with the mean, or approximate median, of the values seen in training,
+    or with the constant fill_value.
+    Sparse feature types, such as Text, may only be filled in with a constant, as other imputes make them dense.
+    If indicator, an extra column records which values are missing.
+    """
+
+    impute_types = ('mean', 'median', 'constant')
+
+    def __init__(self, feature_type, impute='mean', fill_value=None, indicator=False):
+        if impute not in self.impute_types:
+            raise ValueError(
+                "Unknown impute {!r} (expected one of {!r})".format(impute, self.impute_types)
+            )
+
+        if impute != 'constant' and feature_type.sparse:
+            raise ValueError(
+                "May not impute the {} of sparse feature type {!r} (expected impute='constant')".format(
+                    impute,
+                    feature_type.__class__.__name__
+                )
+            )
+
+        self.feature_type = feature_type
+        self.impute = impute
+        self.fill_value = feature_type.validate(fill_value) if impute == 'constant' else None
+        self.indicator = indicator
+
+    @property
+    def feature_count(self):
+        return self.feature_type.feature_count + int(self.indicator)
+
+    @property
+    def sparse(self):
+        return self.feature_type.sparse
+
+    @staticmethod
+    def is_missing(value):
+        if isinstance(value, str):
+            return value == ''
+
+        if isinstance(value, float):
+            return isnan(value)
+
+        return value is None
+
+    def validate(self, value):
+        if self.is_missing(value):
+            return None
+
+        return self.feature_type.validate(value)
+
+    def column_scales(self):
+        scales = self.feature_type.column_scales()
+
+        if scales is None:
+            return None
+
+        return scales + [None] * int(self.indicator)
+
+    def column_imputes(self):
+        if self.impute == 'constant':
+            imputes = self.feature_type.column_imputes()
+
+            if imputes is None:
+                return None
+        else:
+            imputes = [self.impute] * self.feature_type.feature_count
+
+        return imputes + [None] * int(self.indicator)
+
+    def encoded_bytes(self, dtype=None):
+        item_bytes = numpy_dtype(dtype or float64).itemsize
+
+        if self.impute != 'constant':
+            # Values are made dense, to leave room for missing values
+            value_bytes = item_bytes * self.feature_type.feature_count
+        elif self.indicator:
+            # Values are stacked alongside the indicator, as float64 unless stacked as dtype
+            value_bytes = self.feature_type.encoded_bytes(dtype or float64)
+        else:
+            value_bytes = self.feature_type.encoded_bytes(dtype)
+
+        return value_bytes + item_bytes * int(self.indicator)
+
+    def to_series(self, value):
+        features = self.to_array([value])
+
+        return Series((features.toarray() if issparse(features) else features)[0])
+
+    def from_series(self, features):
+        return self.from_array(features.to_numpy().reshape(1, -1))[0]
+
+    def to_array(self, values):
+        missing = asarray([self.is_missing(value) for value in values], dtype=bool)
+
+        if self.impute == 'constant':
+            features = self.feature_type.to_array([
+                self.fill_value if value_missing else value
+                for value, value_missing in zip(values, missing)
+            ])
+        else:
+            # Leave missing values as NaN, to be filled in once the statistics are known
+            present_features = self.feature_type.to_array([
+                value
+                for value, value_missing in zip(values, missing)
+                if not value_missing
+            ])
+
+            features = full((len(values), self.feature_type.feature_count), nan, dtype=float64)
+            features[~missing] = present_features.toarray() if issparse(present_features) else present_features
+
+        if self.indicator:
+            features = hstack_features([features, missing.reshape(-1, 1).astype(float64)], len(values))
+
+        return features
+
+    def from_array(self, features):
+        values = self.feature_type.from_array(features[:, :self.feature_type.feature_count])
+
+        if self.indicator:
+            values = values.astype(object)
+            values[features[:, -1] > 0.5] = None
+
+        return values
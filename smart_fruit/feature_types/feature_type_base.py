@@ -1,24 +1,43 @@
 from abc import ABCMeta
 
+from numpy import array, dtype as numpy_dtype, float64
 from pandas import Series
 
+from smart_fruit.utils import object_array
+
 __all__ = ["FeatureType"]
 
+_shared_index = object()
+
 
 class FeatureType(metaclass=ABCMeta):
     _index = None
     feature_count = 1
 
+    # Whether to_array gives a sparse matrix, rather than a dense array
+    sparse = False
+
+    def __set_name__(self, owner, name):
+        # Found once, when the class is made, so reading a feature never writes shared state
+        index = [
+            key
+            for key, value in owner.__dict__.items()
+            if isinstance(value, FeatureType)
+        ].index(name)
+
+        # Feature types shared between classes, at different positions, look up their index on each read
+        self._index = index if self._index in (None, index) else _shared_index
+
     def __get__(self, instance, owner):
         if instance is None:
             return self
 
-        if self._index is None:
-            self._index = next(
+        if self._index is None or self._index is _shared_index:
+            return instance[next(
                 i
                 for i, name in enumerate(owner._fields)
                 if getattr(owner, name) is self
-            )
+            )]
 
         return instance[self._index]
 
@@ -30,3 +49,57 @@ class FeatureType(metaclass=ABCMeta):
 
     def from_series(self, features):
         return features.iloc[0]
+
+    def column_scales(self):
+        """
+        How each encoded column should be scaled, as a list of 'standard', 'minmax', or None
+
+        None if no columns are to be scaled
+        """
+        return None
+
+    def column_imputes(self):
+        """
+        How missing (NaN) values in each encoded column should be filled in, as a list of 'mean', 'median', or None
+
+        None if no columns are to be imputed
+        """
+        return None
+
+    def encoded_bytes(self, dtype=None):
+        """
+        Approximate number of bytes of memory a single value takes up, once encoded
+
+        Parameters:
+            dtype - Numpy dtype the encoded features are stacked as
+                If not given, the size of the block given by to_array
+        """
+        return numpy_dtype(dtype or float64).itemsize * self.feature_count
+
+    def _overrides(self, method_name, feature_class):
+        """
+        Whether a subclass overrides the given method of feature_class
+
+        Vectorised to_array and from_array methods fall back to the row-by-row encoding of FeatureType,
+        so subclasses overriding only to_series, or from_series, are still used
+        """
+        return getattr(type(self), method_name) is not getattr(feature_class, method_name)
+
+    def to_array(self, values):
+        """
+        Encode a sequence of values as a 2D array, with one row per value
+
+        Override this, alongside to_series, to encode a whole column of values at once
+        """
+        return array(
+            [self.to_series(value) for value in values],
+            dtype=float64
+        ).reshape(len(values), self.feature_count)
+
+    def from_array(self, features):
+        """
+        Decode a 2D array of features, with one row per value, into a 1D array of values
+
+        Override this, alongside from_series, to decode a whole column of values at once
+        """
+        return object_array(self.from_series(Series(row)) for row in features)
@@ -0,0 +1,122 @@
+from numpy import arange, dtype as numpy_dtype, float64, ones
+from pandas import Series
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.utils import murmurhash3_32
+
+from smart_fruit.feature_types.feature_type_base import FeatureType
+
+__all__ = ["HashedLabel", "Text"]
+
+
+class HashedLabel(FeatureType):
+    """
+    A label feature, taking any value, encoded into a fixed number of sparse columns by hashing
+
+    Values are hashed by their string representation, so no list of labels need be kept.
+    If signed, each value is given a sign by its hash, so collisions tend to cancel out, rather than accumulate.
+    """
+
+    sparse = True
+
+    def __init__(self, n_buckets, seed=0, signed=False):
+        if n_buckets <= 0:
+            raise ValueError(
+                "n_buckets must be strictly positive (given {})".format(n_buckets)
+            )
+
+        self.n_buckets = n_buckets
+        self.seed = seed
+        self.signed = signed
+
+    @property
+    def feature_count(self):
+        return self.n_buckets
+
+    def encoded_bytes(self, dtype=None):
+        # A single non-zero value, its column index, and its row pointer
+        return numpy_dtype(dtype or float64).itemsize + 8
+
+    def _hash(self, value):
+        return murmurhash3_32(str(value), seed=self.seed, positive=not self.signed)
+
+    def to_series(self, value):
+        return Series(self.to_array([value]).toarray()[0])
+
+    def from_series(self, features):
+        raise TypeError(
+            "May not predict a {}".format(self.__class__.__name__)
+        )
+
+    def to_array(self, values):
+        hashes = [self._hash(value) for value in values]
+
+        if self.signed:
+            data = [1 if hash_ >= 0 else -1 for hash_ in hashes]
+            buckets = [abs(hash_) % self.n_buckets for hash_ in hashes]
+        else:
+            data = ones(len(hashes), dtype=float64)
+            buckets = [hash_ % self.n_buckets for hash_ in hashes]
+
+        return csr_matrix(
+            (data, buckets, arange(len(values) + 1)),
+            shape=(len(values), self.n_buckets),
+            dtype=float64
+        )
+
+    def from_array(self, features):
+        return self.from_series(features)
+
+
+class Text(FeatureType):
+    """
+    A free text feature, encoded into a fixed number of sparse columns by hashing its word n-grams
+
+    Stateless, so text may be encoded in chunks, or in parallel, without first building a vocabulary.
+    Memory is estimated assuming each text has estimated_ngram_count distinct n-grams.
+    """
+
+    estimated_ngram_count = 64
+    sparse = True
+
+    def __init__(self, n_features=2 ** 20, ngram_range=(1, 1), signed=True):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.signed = signed
+
+        self._vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=self.ngram_range,
+            alternate_sign=signed,
+            dtype=float64
+        )
+
+    @property
+    def feature_count(self):
+        return self.n_features
+
+    def encoded_bytes(self, dtype=None):
+        # Each n-gram is a non-zero value, and its column index, followed by a row pointer
+        return (numpy_dtype(dtype or float64).itemsize + 4) * self.estimated_ngram_count + 4
+
+    def validate(self, value):
+        if not isinstance(value, str):
+            raise TypeError(
+                "May not assign non-string value {!r} to a {}".format(value, self.__class__.__name__)
+            )
+
+        return value
+
+    def to_series(self, value):
+        return Series(self.to_array([value]).toarray()[0])
+
+    def from_series(self, features):
+        raise TypeError(
+            "May not predict a {}".format(self.__class__.__name__)
+        )
+
+    def to_array(self, values):
+        return self._vectorizer.transform(values)
+
+    def from_array(self, features):
+        return self.from_series(features)
@@ -1,14 +1,24 @@
 from collections import namedtuple
 
-from numpy import isfinite
+from numpy import arange, argmax, asarray, column_stack, complex128, empty, float64, isfinite, rint, uint8, zeros
 from pandas import Series
 
 from smart_fruit.feature_types.feature_type_base import FeatureType
+from smart_fruit.statistics import ColumnStatistics
+from smart_fruit.utils import object_array
 
 __all__ = ["Number", "Integer", "Complex", "Label", "Tag"]
 
 
 class Number(FeatureType):
+    def __init__(self, scale=None):
+        if scale is not None and scale not in ColumnStatistics.scale_types:
+            raise ValueError(
+                "Unknown scale {!r} (expected one of {!r})".format(scale, ColumnStatistics.scale_types)
+            )
+
+        self.scale = scale
+
     def validate(self, value):
         value = float(value)
 
@@ -22,6 +32,24 @@ class Number(FeatureType):
 
         return value
 
+    def column_scales(self):
+        if self.scale is None:
+            return None
+
+        return [self.scale]
+
+    def to_array(self, values):
+        if self._overrides('to_series', Number):
+            return super().to_array(values)
+
+        return asarray(values, dtype=float64).reshape(len(values), 1)
+
+    def from_array(self, features):
+        if self._overrides('from_series', Number):
+            return super().from_array(features)
+
+        return features[:, 0]
+
 
 class Integer(Number):
     def validate(self, value):
@@ -30,6 +58,12 @@ class Integer(Number):
     def from_series(self, features):
         return int(round(super().from_series(features)))
 
+    def from_array(self, features):
+        if self._overrides('from_series', Integer):
+            return FeatureType.from_array(self, features)
+
+        return rint(features[:, 0]).astype(int)
+
 
 class Complex(FeatureType):
     feature_count = 2
@@ -53,6 +87,20 @@ class Complex(FeatureType):
     def from_series(self, features):
         return complex(*features)
 
+    def to_array(self, values):
+        if self._overrides('to_series', Complex):
+            return super().to_array(values)
+
+        values = asarray(values, dtype=complex128)
+
+        return column_stack([values.real, values.imag])
+
+    def from_array(self, features):
+        if self._overrides('from_series', Complex):
+            return super().from_array(features)
+
+        return features[:, 0] + 1j * features[:, 1]
+
 
 class Label(FeatureType, namedtuple('Label', ['labels'])):
     @property
@@ -76,6 +124,40 @@ class Label(FeatureType, namedtuple('Label', ['labels'])):
     def from_series(self, features):
         return max(zip(features, enumerate(self.labels)))[1][1]
 
+    def _label_indices(self, values):
+        labels = list(self.labels)
+
+        try:
+            label_indices = {label: i for i, label in enumerate(labels)}
+            return [label_indices[value] for value in values]
+        except (TypeError, KeyError):
+            return [labels.index(value) for value in values]
+
+    def encoded_bytes(self, dtype=None):
+        if dtype is None and not self._overrides('to_series', Label):
+            # One-hot blocks are a byte per label until stacked
+            return self.feature_count
+
+        return super().encoded_bytes(dtype)
+
+    def to_array(self, values):
+        if self._overrides('to_series', Label):
+            return super().to_array(values)
+
+        features = zeros((len(values), len(self.labels)), dtype=uint8)
+        features[arange(len(values)), self._label_indices(values)] = 1
+
+        return features
+
+    def from_array(self, features):
+        if self._overrides('from_series', Label):
+            return super().from_array(features)
+
+        # Break ties in favour of the later label, as from_series does
+        label_indices = features.shape[1] - 1 - argmax(features[:, ::-1], axis=1)
+
+        return object_array(self.labels)[label_indices]
+
 
 class Tag(FeatureType):
     feature_count = 0
@@ -87,3 +169,9 @@ class Tag(FeatureType):
         raise TypeError(
             "May not predict a {}".format(self.__class__.__name__)
         )
+
+    def to_array(self, values):
+        return empty((len(values), 0), dtype=float64)
+
+    def from_array(self, features):
+        return self.from_series(features)
@@ -0,0 +1,123 @@
+from numpy import asarray, float64, ones, outer, zeros
+from numpy.linalg import lstsq
+from scipy.sparse import issparse
+from sklearn.linear_model import LinearRegression
+
+__all__ = ["NormalEquations"]
+
+
+class NormalEquations:
+    """
+    The normal equations of an ordinary least squares regression, accumulated from a stream of blocks of rows
+
+    Rows may be weighted, as if repeated that many times.
+    Only the means, and centred cross products, of the inputs and outputs are kept,
+    so memory is proportional to the square of the number of input columns, not the number of rows.
+    Blocks are combined as in RunningMoments, so the equations of separate streams may be merged.
+    """
+
+    # The input cross products are a dense square matrix, so only accumulate them for this many input columns, or fewer
+    max_input_count = 4096
+
+    def __init__(self, input_count, output_count):
+        self.count = 0
+        self.input_mean = zeros(input_count, dtype=float64)
+        self.output_mean = zeros(output_count, dtype=float64)
+        self.input_products = zeros((input_count, input_count), dtype=float64)
+        self.cross_products = zeros((input_count, output_count), dtype=float64)
+
+    @staticmethod
+    def can_solve(model):
+        """
+        Whether the normal equations give the same solution as fitting the given model
+        """
+        return type(model) is LinearRegression and not getattr(model, 'positive', False)
+
+    @classmethod
+    def can_accumulate(cls, input_count):
+        """
+        Whether the normal equations of input_count input columns are small enough to hold in memory
+        """
+        return input_count <= cls.max_input_count
+
+    def _combine(self, count, input_mean, output_mean, input_products, cross_products):
+        total = self.count + count
+
+        if not total:
+            return
+
+        input_delta = input_mean - self.input_mean
+        output_delta = output_mean - self.output_mean
+        weight = self.count * count / total
+
+        self.input_products = self.input_products + input_products + outer(input_delta, input_delta) * weight
+        self.cross_products = self.cross_products + cross_products + outer(input_delta, output_delta) * weight
+        self.input_mean = self.input_mean + input_delta * count / total
+        self.output_mean = self.output_mean + output_delta * count / total
+        self.count = total
+
+    def update(self, x, y, sample_weight=None):
+        if not x.shape[0]:
+            return
+
+        weights = ones(x.shape[0]) if sample_weight is None else asarray(sample_weight, dtype=float64)
+        count = weights.sum()
+
+        y = asarray(y, dtype=float64)
+        input_mean = asarray(x.T @ weights, dtype=float64).ravel() / count
+        output_mean = weights @ y / count
+
+        if issparse(x):
+            # Centring would make the block dense, so subtract the means from the uncentred products instead
+            input_products = (
+                asarray((x.T @ x.multiply(weights[:, None])).todense())
+                - count * outer(input_mean, input_mean)
+            )
+            cross_products = asarray(x.T @ (y * weights[:, None])) - count * outer(input_mean, output_mean)
+        else:
+            centred_x = asarray(x, dtype=float64) - input_mean
+            weighted_x = centred_x * weights[:, None]
+            input_products = weighted_x.T @ centred_x
+            cross_products = weighted_x.T @ (y - output_mean)
+
+        self._combine(count, input_mean, output_mean, input_products, cross_products)
+
+    def merge(self, other):
+        self._combine(other.count, other.input_mean, other.output_mean, other.input_products, other.cross_products)
+
+    def transform(self, matrix, offset):
+        """
+        The normal equations of the inputs transformed by x @ matrix + offset, for a (sparse) matrix
+        """
+
+        equations = NormalEquations(matrix.shape[1], len(self.output_mean))
+
+        equations.count = self.count
+        equations.input_mean = matrix.T @ self.input_mean + offset
+        equations.output_mean = self.output_mean.copy()
+        # Offsets cancel out of centred products
+        equations.input_products = matrix.T @ (matrix.T @ self.input_products).T
+        equations.cross_products = matrix.T @ self.cross_products
+
+        return equations
+
+    def solve(self, model):
+        """
+        Set the coefficients of a LinearRegression to the solution of the equations, returning the model
+
+        As for LinearRegression, the minimum norm solution is found when the inputs are not linearly independent.
+        """
+
+        if model.fit_intercept:
+            input_products, cross_products = self.input_products, self.cross_products
+        else:
+            input_products = self.input_products + self.count * outer(self.input_mean, self.input_mean)
+            cross_products = self.cross_products + self.count * outer(self.input_mean, self.output_mean)
+
+        coefficients = lstsq(input_products, cross_products, rcond=None)[0].T
+
+        model.coef_ = coefficients
+        model.intercept_ = self.output_mean - coefficients @ self.input_mean if model.fit_intercept else 0.0
+        model.n_features_in_ = len(self.input_mean)
+
+        return model
@@ -0,0 +1,124 @@
+from numpy import abs as absolute, asarray, float64, where, zeros
+from sklearn.base import is_regressor
+
+from smart_fruit.per_output import PerOutputModel
+
+__all__ = ["R2Score", "MeanAbsoluteError", "Accuracy"]
+
+
+class R2Score:
+    """
+    Coefficient of determination of a stream of 2D blocks of predictions, averaged uniformly over the columns
+
+    As for scikit-learn's r2_score, a column with constant true values scores 1 if predicted exactly, and 0 otherwise.
+    Only the mean, and sums of squares, of each column are kept, combined as in RunningMoments,
+    so scores of separate streams may be merged.
+    """
+
+    def __init__(self, column_count):
+        self.count = 0
+        self.mean = zeros(column_count, dtype=float64)
+        self.total_squares = zeros(column_count, dtype=float64)
+        self.residual_squares = zeros(column_count, dtype=float64)
+
+    @staticmethod
+    def can_score(model):
+        """
+        Whether the R² score of the encoded outputs is the same as the given model's own score
+        """
+        return is_regressor(model) or isinstance(model, PerOutputModel)
+
+    def _combine(self, count, mean, total_squares, residual_squares):
+        total = self.count + count
+
+        if not total:
+            return
+
+        delta = mean - self.mean
+
+        self.total_squares = self.total_squares + total_squares + delta ** 2 * self.count * count / total
+        self.residual_squares = self.residual_squares + residual_squares
+        self.mean = self.mean + delta * count / total
+        self.count = total
+
+    def update(self, y_true, y_pred):
+        y_true = asarray(y_true, dtype=float64)
+
+        if not y_true.shape[0]:
+            return
+
+        mean = y_true.mean(axis=0)
+
+        self._combine(
+            y_true.shape[0],
+            mean,
+            ((y_true - mean) ** 2).sum(axis=0),
+            ((y_true - asarray(y_pred, dtype=float64)) ** 2).sum(axis=0)
+        )
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.total_squares, other.residual_squares)
+
+    def result(self):
+        if not len(self.mean):
+            return 1.0
+
+        scores = where(
+            self.total_squares > 0,
+            1 - self.residual_squares / where(self.total_squares > 0, self.total_squares, 1),
+            where(self.residual_squares > 0, 0.0, 1.0)
+        )
+
+        return float(scores.mean())
+
+
+class MeanAbsoluteError:
+    """
+    Mean absolute error of a stream of 2D blocks of predictions, averaged uniformly over the columns
+    """
+
+    def __init__(self, column_count):
+        self.count = 0
+        self.absolute_errors = zeros(column_count, dtype=float64)
+
+    def update(self, y_true, y_pred):
+        errors = absolute(asarray(y_true, dtype=float64) - asarray(y_pred, dtype=float64))
+
+        self.count += errors.shape[0]
+        self.absolute_errors = self.absolute_errors + errors.sum(axis=0)
+
+    def merge(self, other):
+        self.count += other.count
+        self.absolute_errors = self.absolute_errors + other.absolute_errors
+
+    def result(self):
+        if not self.count or not len(self.absolute_errors):
+            return 0.0
+
+        return float((self.absolute_errors / self.count).mean())
+
+
+class Accuracy:
+    """
+    Proportion of a stream of label predictions that are correct
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.correct = 0
+
+    def update(self, y_true, y_pred):
+        y_true = asarray(y_true)
+
+        self.count += y_true.shape[0]
+        self.correct += int((y_true == asarray(y_pred)).sum())
+
+    def merge(self, other):
+        self.count += other.count
+        self.correct += other.correct
+
+    def result(self):
+        if not self.count:
+            return 0.0
+
+        return self.correct / self.count
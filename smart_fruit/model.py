@@ -1,15 +1,71 @@
-from pandas import DataFrame, concat
-from pandas.core.apply import frame_apply
+from asyncio import get_event_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from os import cpu_count
+
+from numpy import arange, asarray, column_stack, concatenate, empty, float64, ones, where, zeros
+from scipy.sparse import coo_matrix, issparse
 
 from sklearn import linear_model
+from sklearn.utils.validation import has_fit_parameter
 
 from smart_fruit.feature_class import FeatureClassMeta
-from smart_fruit.model_selection import train_test_split
-from smart_fruit.utils import csv_open
+from smart_fruit.feature_store import FeatureStore
+from smart_fruit.least_squares import NormalEquations
+from smart_fruit.metrics import Accuracy, MeanAbsoluteError, R2Score
+from smart_fruit.feature_types import Label, Optional
+from smart_fruit.model_selection import reservoir_sample, train_test_split
+from smart_fruit.per_output import PerOutputModel
+from smart_fruit.prediction_cache import PredictionCache
+from smart_fruit.shared_model import SharedModel
+from smart_fruit.statistics import ColumnStatistics, with_missing_indicators
+from smart_fruit.utils import (
+    async_chunks, async_iter, chunks, csv_open, csv_paths, csv_read_shard, csv_shards, hstack_features,
+    iterate_in_executor, parallel_map, row_keys, vstack_features
+)
 
 __all__ = ["Model"]
 
 
+def _read_csv_shard(model_class, input_only, shard):
+    """
+    Read, and validate, a shard of a CSV file in a worker process
+
+    Features are returned as plain tuples, as feature classes are made dynamically, so cannot be pickled.
+    """
+
+    features = model_class._features_from_csv_rows(
+        csv_read_shard(*shard, required_columns=model_class._required_columns(input_only)),
+        input_only
+    )
+
+    if input_only:
+        return [tuple(input_) for input_ in features]
+
+    return [(tuple(input_), tuple(output)) for input_, output in features]
+
+
+def _accumulate_normal_equations(model_class, features):
+    """
+    Accumulate the normal equations of a chunk of input/output pairs, given as plain tuples, in a worker process
+    """
+
+    return model_class._accumulate_normal_equations(
+        [(model_class.Input._make(input_), model_class.Output._make(output)) for input_, output in features]
+    )
+
+
+def _chunk_metrics(model, features):
+    """
+    Accumulate the metrics of a trained model on a chunk of input/output pairs, as plain tuples, in a worker process
+    """
+
+    return model._chunk_metrics(
+        [(model.Input._make(input_), model.Output._make(output)) for input_, output in features]
+    )
+
+
 class ModelMeta(type):
     def __init__(cls, name, bases, namespace):
         super().__init__(name, bases, namespace)
@@ -19,9 +75,17 @@ class ModelMeta(type):
 
             setattr(cls, feature_type, FeatureClassMeta(feature_class.__name__, (feature_class,), {}))
 
+        if any(feature_type.column_scales() or feature_type.column_imputes() for feature_type in cls.Output):
+            raise TypeError("May only scale, or impute, input features")
+
 
 class Model(metaclass=ModelMeta):
     model_class = linear_model.LinearRegression
+    classifier_class = linear_model.LogisticRegression
+    fit_per_output = False
+    n_jobs = None
+    dtype = float64
+    updatable = False
 
     class Input:
         pass
@@ -30,7 +94,41 @@ class Model(metaclass=ModelMeta):
         pass
 
     def __init__(self, *args, **kwargs):
-        self.model = self.model_class(*args, **kwargs)
+        if self.fit_per_output:
+            self.model = PerOutputModel(
+                self.Output,
+                partial(self.model_class, *args, **kwargs),
+                self.classifier_class,
+                n_jobs=self.n_jobs
+            )
+        else:
+            self.model = self.model_class(*args, **kwargs)
+
+        self.input_statistics = self._new_input_statistics()
+        self.normal_equations = None
+        self.prediction_cache = None
+        self.shared_model = None
+
+    def __getstate__(self):
+        # Models attached to shared memory are pickled by value
+        return dict(self.__dict__, shared_model=None)
+
+    def __setstate__(self, state):
+        # Models pickled by earlier versions only kept the underlying model
+        self.input_statistics = self._new_input_statistics()
+        self.normal_equations = None
+        self.prediction_cache = None
+        self.shared_model = None
+
+        self.__dict__.update(state)
+
+    @classmethod
+    def _new_input_statistics(cls):
+        return {
+            i: ColumnStatistics(feature_type.column_scales(), feature_type.column_imputes())
+            for i, feature_type in cls.Input._encoded_features
+            if feature_type.column_scales() or feature_type.column_imputes()
+        }
 
     @classmethod
     def input_features_from_list(cls, lists):
@@ -43,8 +141,14 @@ class Model(metaclass=ModelMeta):
             yield cls.Input.from_json(feature).validate()
 
     @classmethod
-    def input_features_from_csv(cls, csv_path):
-        yield from cls.input_features_from_json(csv_open(csv_path, cls.Input._fields))
+    def input_features_from_csv(cls, csv_path, workers=None, preserve_order=True, split_bytes=None):
+        yield from cls._features_from_csv(
+            csv_path,
+            input_only=True,
+            workers=workers,
+            preserve_order=preserve_order,
+            split_bytes=split_bytes
+        )
 
     @classmethod
     def features_from_list(cls, lists):
@@ -57,27 +161,510 @@ class Model(metaclass=ModelMeta):
             yield cls.Input.from_json(feature).validate(), cls.Output.from_json(feature).validate()
 
     @classmethod
-    def features_from_csv(cls, csv_path):
-        yield from cls.features_from_json(csv_open(csv_path, cls.Input._fields + cls.Output._fields))
+    def features_from_csv(cls, csv_path, workers=None, preserve_order=True, split_bytes=None):
+        yield from cls._features_from_csv(
+            csv_path,
+            input_only=False,
+            workers=workers,
+            preserve_order=preserve_order,
+            split_bytes=split_bytes
+        )
+
+    @classmethod
+    async def ainput_features_from_json(cls, json):
+        """
+        Asynchronous version of input_features_from_json, taking an iterable, or an asynchronous iterable
+        """
+        async for feature in async_iter(json):
+            yield cls.Input.from_json(feature).validate()
+
+    @classmethod
+    async def ainput_features_from_csv(
+        cls, csv_path, workers=None, preserve_order=True, split_bytes=None, chunk_size=1000, executor=None
+    ):
+        """
+        Asynchronous version of input_features_from_csv, reading chunk_size features at a time in an executor
+        """
+
+        input_features = cls.input_features_from_csv(
+            csv_path,
+            workers=workers,
+            preserve_order=preserve_order,
+            split_bytes=split_bytes
+        )
+
+        async for input_ in iterate_in_executor(input_features, chunk_size, executor=executor):
+            yield input_
+
+    @classmethod
+    async def afeatures_from_json(cls, json):
+        """
+        Asynchronous version of features_from_json, taking an iterable, or an asynchronous iterable
+        """
+        async for feature in async_iter(json):
+            yield cls.Input.from_json(feature).validate(), cls.Output.from_json(feature).validate()
+
+    @classmethod
+    async def afeatures_from_csv(
+        cls, csv_path, workers=None, preserve_order=True, split_bytes=None, chunk_size=1000, executor=None
+    ):
+        """
+        Asynchronous version of features_from_csv, reading chunk_size features at a time in an executor
+        """
+
+        features = cls.features_from_csv(
+            csv_path,
+            workers=workers,
+            preserve_order=preserve_order,
+            split_bytes=split_bytes
+        )
+
+        async for feature in iterate_in_executor(features, chunk_size, executor=executor):
+            yield feature
+
+    @classmethod
+    def _features_from_csv_rows(cls, rows, input_only):
+        if input_only:
+            return cls.input_features_from_json(rows)
+
+        return cls.features_from_json(rows)
+
+    @classmethod
+    def _required_columns(cls, input_only):
+        """
+        Names of the features that are not Optional, whose columns may not be left out of the ends of CSV rows
+        """
+        feature_classes = (cls.Input,) if input_only else (cls.Input, cls.Output)
+
+        return frozenset(
+            name
+            for feature_class in feature_classes
+            for name, feature_type in zip(feature_class._fields, feature_class)
+            if not isinstance(feature_type, Optional)
+        )
+
+    @classmethod
+    def _features_from_csv(cls, csv_path, input_only, workers, preserve_order, split_bytes):
+        expected_columns = cls.Input._fields if input_only else cls.Input._fields + cls.Output._fields
+        required_columns = cls._required_columns(input_only)
+
+        # Single files are streamed once, without seeking, so may be pipes, such as /dev/stdin
+        single_file = isinstance(csv_path, str) and workers is None and split_bytes is None and (
+            csv_paths(csv_path) == [csv_path]
+        )
+
+        if single_file or not isinstance(csv_path, (str, list, tuple)):
+            yield from cls._features_from_csv_rows(
+                csv_open(csv_path, expected_columns, required_columns=required_columns),
+                input_only
+            )
+            return
+
+        shards = csv_shards(csv_paths(csv_path), expected_columns, split_bytes=split_bytes)
+
+        if workers is None:
+            for shard in shards:
+                yield from cls._features_from_csv_rows(
+                    csv_read_shard(*shard, required_columns=required_columns),
+                    input_only
+                )
+            return
+
+        for shard_features in parallel_map(
+            partial(_read_csv_shard, cls, input_only),
+            shards,
+            workers,
+            preserve_order=preserve_order
+        ):
+            if input_only:
+                yield from map(cls.Input._make, shard_features)
+            else:
+                for input_, output in shard_features:
+                    yield cls.Input._make(input_), cls.Output._make(output)
 
     @staticmethod
-    def _to_raw_features(dataframe, feature_class):
-        return concat([
-            column.apply(feature_type.to_series)
-            for (i, column), feature_type in zip(dataframe.iteritems(), feature_class)
-        ], axis=1)
+    def _raw_blocks(features, feature_class):
+        return {
+            i: feature_type.to_array([feature[i] for feature in features])
+            for i, feature_type in feature_class._encoded_features
+        }
+
+    @classmethod
+    def _stack_blocks(cls, blocks, row_count, statistics=None):
+        statistics = statistics or {}
+
+        return hstack_features([
+            statistics[i].transform(block) if i in statistics else block
+            for i, block in blocks.items()
+        ], row_count, cls.dtype)
+
+    @classmethod
+    def _to_raw_features(cls, features, feature_class, statistics=None):
+        return cls._stack_blocks(cls._raw_blocks(features, feature_class), len(features), statistics)
+
+    @classmethod
+    def _arrays_from_features(cls, features, input_statistics=None, update_statistics=False):
+        features = list(features)
+
+        input_blocks = cls._raw_blocks([input_ for input_, output in features], cls.Input)
+
+        if update_statistics:
+            for i, field_statistics in input_statistics.items():
+                field_statistics.update(input_blocks[i])
+
+        input_array = cls._stack_blocks(input_blocks, len(features), input_statistics)
+        output_array = cls._to_raw_features([output for input_, output in features], cls.Output)
+
+        # Models expect dense targets
+        if issparse(output_array):
+            output_array = output_array.toarray()
+
+        return input_array, output_array
+
+    @staticmethod
+    def _column_slices(feature_class):
+        slices = {}
+
+        start = 0
+        for i, feature_type in enumerate(feature_class):
+            slices[i] = slice(start, start + feature_type.feature_count)
+            start += feature_type.feature_count
+
+        return slices
+
+    @classmethod
+    def _imputed_columns(cls, input_statistics):
+        slices = cls._column_slices(cls.Input)
 
-    def _dataframes_from_features(self, features):
-        dataframe = DataFrame(list(input_) + list(output) for input_, output in features)
+        return [
+            slices[i].start + j
+            for i, field_statistics in input_statistics.items()
+            for j in field_statistics.imputed_columns
+        ]
 
-        input_dataframe = self._to_raw_features(dataframe, self.Input)
-        output_dataframe = self._to_raw_features(dataframe.loc[:, len(self.Input):], self.Output)
+    @classmethod
+    def _accumulate_normal_equations(cls, features):
+        """
+        Learn the input statistics, and the normal equations of the unscaled inputs, of a chunk of input/output pairs
+
+        Missing values are left as 0, and each imputed column given an indicator column, as for with_missing_indicators,
+        so the normal equations of the imputed, and scaled, inputs may be found once all chunks are seen.
+        """
+
+        input_statistics = cls._new_input_statistics()
+        input_column_slices = cls._column_slices(cls.Input)
+
+        input_array, output_array = cls._arrays_from_features(features)
+
+        for i, field_statistics in input_statistics.items():
+            field_statistics.update(input_array[:, input_column_slices[i]])
+
+        input_array = with_missing_indicators(input_array, cls._imputed_columns(input_statistics))
+
+        normal_equations = NormalEquations(input_array.shape[1], output_array.shape[1])
+        normal_equations.update(input_array, output_array)
+
+        return normal_equations, input_statistics
+
+    @classmethod
+    def _input_linear_transform(cls, input_statistics):
+        """
+        The imputation, and scaling, of all input columns, as in ColumnStatistics.linear_transform
+        """
+
+        column_count = sum(feature_type.feature_count for feature_type in cls.Input)
+
+        rows, columns, values = [empty(0, dtype=int)], [empty(0, dtype=int)], [empty(0, dtype=float64)]
+        offset = zeros(column_count)
+        indicator_row = column_count
+
+        for i, feature_slice in cls._column_slices(cls.Input).items():
+            if i not in input_statistics:
+                indices = arange(feature_slice.start, feature_slice.stop)
+
+                rows.append(indices)
+                columns.append(indices)
+                values.append(ones(len(indices)))
+                continue
+
+            matrix, offset[feature_slice] = input_statistics[i].linear_transform()
+            matrix = matrix.tocoo()
+
+            width = feature_slice.stop - feature_slice.start
+
+            rows.append(where(
+                matrix.row < width,
+                feature_slice.start + matrix.row,
+                indicator_row + matrix.row - width
+            ))
+            columns.append(feature_slice.start + matrix.col)
+            values.append(matrix.data)
+
+            indicator_row += matrix.shape[0] - width
+
+        matrix = coo_matrix(
+            (concatenate(values), (concatenate(rows), concatenate(columns))),
+            shape=(indicator_row, column_count)
+        )
+
+        return matrix.tocsr(), offset
+
+    @classmethod
+    def _normal_equations_input_count(cls):
+        """
+        Number of input columns of the normal equations accumulated in chunks, including missing value indicators
+        """
+
+        return (
+            sum(feature_type.feature_count for feature_type in cls.Input)
+            + len(cls._imputed_columns(cls._new_input_statistics()))
+        )
+
+    @classmethod
+    def _can_train_in_chunks(cls, model):
+        """
+        Whether model may be trained in chunks, by accumulating its normal equations
+        """
+
+        return NormalEquations.can_solve(model) and NormalEquations.can_accumulate(cls._normal_equations_input_count())
+
+    def _fit_chunks(self, features, chunk_size, workers):
+        if not NormalEquations.can_solve(self.model):
+            raise TypeError(
+                "May not train a {} in chunks (expected LinearRegression)".format(self.model.__class__.__name__)
+            )
+
+        if not NormalEquations.can_accumulate(self._normal_equations_input_count()):
+            raise TypeError(
+                "May not train in chunks with {} encoded input columns (expected at most {})".format(
+                    self._normal_equations_input_count(),
+                    NormalEquations.max_input_count
+                )
+            )
+
+        if isinstance(features, FeatureStore):
+            features.check_layout(self.__class__)
+            self.input_statistics = features.input_statistics
+
+            normal_equations = NormalEquations(features.input_array.shape[1], features.output_array.shape[1])
+
+            for start in range(0, len(features), chunk_size):
+                normal_equations.update(
+                    features.input_array[start:start + chunk_size],
+                    features.output_array[start:start + chunk_size]
+                )
+        else:
+            if workers is None:
+                results = map(self._accumulate_normal_equations, chunks(features, chunk_size))
+            else:
+                results = parallel_map(
+                    partial(_accumulate_normal_equations, self.__class__),
+                    (
+                        [(tuple(input_), tuple(output)) for input_, output in chunk]
+                        for chunk in chunks(features, chunk_size)
+                    ),
+                    workers,
+                    preserve_order=False
+                )
+
+            normal_equations = NormalEquations(
+                self._normal_equations_input_count(),
+                sum(feature_type.feature_count for feature_type in self.Output)
+            )
+
+            for chunk_equations, chunk_statistics in results:
+                normal_equations.merge(chunk_equations)
+
+                for i, field_statistics in self.input_statistics.items():
+                    field_statistics.merge(chunk_statistics[i])
+
+            normal_equations = normal_equations.transform(*self._input_linear_transform(self.input_statistics))
+
+        self.normal_equations = normal_equations
+        self.normal_equations.solve(self.model)
+
+    def _encoded_chunks(self, features, chunk_size):
+        """
+        Yields encoded chunks of input/output pairs, learning the input statistics, but not applying them
+        """
+
+        input_column_slices = self._column_slices(self.Input)
+
+        for chunk in chunks(features, chunk_size):
+            input_array, output_array = self._arrays_from_features(chunk)
+
+            for i, field_statistics in self.input_statistics.items():
+                field_statistics.update(input_array[:, input_column_slices[i]])
+
+            yield input_array, output_array
+
+    def _deduplicated_features(self, features, chunk_size=10000):
+        """
+        Encode input/output pairs, collapsing repeated rows into one, weighted by the number of times it is repeated
+
+        Returns the input array, output array, and weights
+        """
+
+        if isinstance(features, FeatureStore):
+            features.check_layout(self.__class__)
+            self.input_statistics = features.input_statistics
+
+            encoded_chunks = (
+                (features.input_array[start:start + chunk_size], features.output_array[start:start + chunk_size])
+                for start in range(0, len(features), chunk_size)
+            )
+        else:
+            encoded_chunks = self._encoded_chunks(features, chunk_size)
+
+        row_indices = {}
+        weights = []
+        input_blocks = []
+        output_blocks = []
+
+        for input_array, output_array in encoded_chunks:
+            new_rows = []
 
-        return input_dataframe, output_dataframe
+            for j, key in enumerate(row_keys(input_array, output_array)):
+                index = row_indices.setdefault(key, len(row_indices))
+
+                if index == len(weights):
+                    weights.append(0)
+                    new_rows.append(j)
+
+                weights[index] += 1
+
+            input_blocks.append(input_array[new_rows])
+            output_blocks.append(output_array[new_rows])
+
+        input_array = vstack_features(input_blocks, self.dtype)
+        output_array = vstack_features(output_blocks, self.dtype)
+
+        if not isinstance(features, FeatureStore):
+            # The statistics are only known once all features are seen, so impute, and scale, the distinct rows
+            input_column_slices = self._column_slices(self.Input)
+
+            input_array = self._stack_blocks(
+                {i: input_array[:, input_column_slices[i]] for i, feature_type in self.Input._encoded_features},
+                input_array.shape[0],
+                self.input_statistics
+            )
+
+        return input_array, output_array, asarray(weights, dtype=float64)
+
+    def _raw_features(self, features, train=False):
+        if isinstance(features, FeatureStore):
+            features.check_layout(self.__class__)
+
+            if train:
+                self.input_statistics = features.input_statistics
+            else:
+                features.check_input_statistics(self.input_statistics)
+
+            return features.input_array, features.output_array
+
+        return self._arrays_from_features(features, self.input_statistics, update_statistics=train)
+
+    @staticmethod
+    def _feature_class_layout(feature_class):
+        return [
+            [name, feature_type.__class__.__name__, feature_type.feature_count]
+            for name, feature_type in zip(feature_class._fields, feature_class)
+        ]
+
+    @classmethod
+    def layout(cls):
+        return {
+            'input': cls._feature_class_layout(cls.Input),
+            'output': cls._feature_class_layout(cls.Output)
+        }
 
     @classmethod
-    def train(cls, features, train_test_split_ratio=None, test_sample_count=None, random_state=None):
+    def estimate_memory(cls, n_rows):
+        """
+        Approximate peak memory, in bytes, used to encode n_rows input/output pairs
+
+        Each feature is encoded into its own block, before the blocks are stacked together as Model.dtype,
+        so is counted once as each.
+        """
+
+        return n_rows * sum(
+            feature_type.encoded_bytes() + feature_type.encoded_bytes(cls.dtype)
+            for feature_class in (cls.Input, cls.Output)
+            for feature_type in feature_class
+        )
+
+    @classmethod
+    def _check_memory(cls, n_rows, memory_limit):
+        if cls.estimate_memory(n_rows) > memory_limit:
+            raise MemoryError(
+                "Encoding {} features needs about {} bytes (memory limit {} bytes)".format(
+                    n_rows, cls.estimate_memory(n_rows), memory_limit
+                )
+            )
+
+    @classmethod
+    def _rows_within(cls, memory_limit):
+        """
+        Number of input/output pairs that may be encoded at once within memory_limit bytes
+        """
+
+        cls._check_memory(1, memory_limit)
+
+        return memory_limit // max(cls.estimate_memory(1), 1)
+
+    @classmethod
+    def _features_within(cls, features, memory_limit):
+        """
+        Read input/output pairs into a list, raising MemoryError as soon as more are read than fit within memory_limit
+        """
+
+        if isinstance(features, FeatureStore):
+            cls._check_memory(len(features), memory_limit)
+
+            return features
+
+        max_rows = cls._rows_within(memory_limit)
+        features = list(islice(features, max_rows + 1))
+
+        if len(features) > max_rows:
+            raise MemoryError(
+                "Encoding more than {} features needs more than the memory limit of {} bytes".format(
+                    max_rows, memory_limit
+                )
+            )
+
+        return features
+
+    @classmethod
+    def _normal_equations_memory(cls):
+        """
+        Approximate memory, in bytes, used to accumulate normal equations, when training in chunks
+
+        The equations accumulated so far, those of a chunk, and their sum, are held at once.
+        """
+
+        input_count = cls._normal_equations_input_count()
+        output_count = sum(feature_type.feature_count for feature_type in cls.Output)
+
+        return 3 * 8 * (input_count + 1) * (input_count + output_count)
+
+    @classmethod
+    def train(
+        cls, features, train_test_split_ratio=None, test_sample_count=None, random_state=None, chunk_size=None,
+        workers=None, dedupe=False, max_samples=None, stratify_by=None, memory_limit=None
+    ):
+        if max_samples is not None:
+            if isinstance(features, FeatureStore):
+                raise ValueError("May not sample a FeatureStore")
+
+            features = cls._sample_features(features, max_samples, stratify_by, random_state)
+        elif stratify_by is not None:
+            raise ValueError("May only stratify_by when sampling, with max_samples")
+
         if train_test_split_ratio is not None or test_sample_count is not None:
+            if isinstance(features, FeatureStore):
+                raise ValueError("May not perform a train/test split on a FeatureStore")
+
             train_features, test_features = train_test_split(
                 features,
                 train_test_split_ratio=train_test_split_ratio,
@@ -85,48 +672,453 @@ class Model(metaclass=ModelMeta):
                 random_state=random_state
             )
 
-            model = cls.train(train_features)
+            model = cls.train(
+                train_features,
+                chunk_size=chunk_size,
+                workers=workers,
+                dedupe=dedupe,
+                memory_limit=memory_limit
+            )
 
-            return model, model.score(test_features)
+            return model, model.score(test_features, memory_limit=memory_limit)
 
         model = cls()
 
-        model.model.fit(*model._dataframes_from_features(features))
+        if memory_limit is not None and chunk_size is None:
+            if dedupe or cls._can_train_in_chunks(model.model):
+                # Encode the features in chunks that fit within the memory limit, alongside the normal equations
+                if cls._can_train_in_chunks(model.model):
+                    if cls._normal_equations_memory() >= memory_limit:
+                        raise MemoryError(
+                            "Accumulating the normal equations needs about {} bytes (memory limit {} bytes)".format(
+                                cls._normal_equations_memory(), memory_limit
+                            )
+                        )
+
+                    memory_limit -= cls._normal_equations_memory()
+
+                chunk_size = cls._rows_within(memory_limit)
+            else:
+                # Fail before all features are read, if they would not fit
+                features = cls._features_within(features, memory_limit)
+
+        if dedupe:
+            if workers is not None:
+                raise ValueError("May not dedupe features when training in worker processes")
+
+            if not NormalEquations.can_solve(model.model) and not has_fit_parameter(model.model, 'sample_weight'):
+                raise TypeError(
+                    "May not dedupe features for a {} (expected sample_weight)".format(model.model.__class__.__name__)
+                )
+
+            input_array, output_array, sample_weight = model._deduplicated_features(features, chunk_size or 10000)
+            model._fit(input_array, output_array, sample_weight)
+        elif (
+            chunk_size is not None
+            or workers is not None
+            # Stores are read a chunk at a time, rather than copied whole into memory, where possible
+            or (isinstance(features, FeatureStore) and cls._can_train_in_chunks(model.model))
+        ):
+            model._fit_chunks(features, chunk_size or 10000, workers)
+        else:
+            model._fit(*model._raw_features(features, train=True))
 
         return model
 
-    def score(self, features):
-        return self.model.score(*self._dataframes_from_features(features))
+    @classmethod
+    def _sample_features(cls, features, max_samples, stratify_by, random_state):
+        if stratify_by is None:
+            return reservoir_sample(features, max_samples, random_state=random_state)
+
+        if stratify_by not in cls.Output._fields or not isinstance(getattr(cls.Output, stratify_by), Label):
+            raise ValueError(
+                "May only stratify_by a Label output feature (given {!r})".format(stratify_by)
+            )
+
+        index = cls.Output._fields.index(stratify_by)
+
+        return reservoir_sample(
+            features,
+            max_samples,
+            stratify=lambda feature: feature[1][index],
+            strata=getattr(cls.Output, stratify_by).labels,
+            random_state=random_state
+        )
+
+    def _fit(self, input_array, output_array, sample_weight=None):
+        if (
+            self.updatable
+            and NormalEquations.can_solve(self.model)
+            and not issparse(input_array)
+            and NormalEquations.can_accumulate(input_array.shape[1])
+        ):
+            # Keep the normal equations, so the model may be updated with new features
+            self.normal_equations = NormalEquations(input_array.shape[1], output_array.shape[1])
+            self.normal_equations.update(input_array, output_array, sample_weight)
+            self.normal_equations.solve(self.model)
+        elif sample_weight is None:
+            self.model.fit(input_array, output_array)
+        else:
+            self.model.fit(input_array, output_array, sample_weight=sample_weight)
+
+    def update(self, features):
+        """
+        Update the model with new input/output pairs, without retraining on the features it was trained with
+
+        The statistics used to impute, and scale, the input features are not updated.
+        """
+
+        input_array, output_array = self._raw_features(features)
+
+        if self.normal_equations is not None:
+            self.normal_equations.update(input_array, output_array)
+            self.normal_equations.solve(self.model)
+        elif hasattr(self.model, 'partial_fit'):
+            self.model.partial_fit(input_array, output_array)
+        else:
+            raise TypeError(
+                "May not update a {} (expected an updatable LinearRegression, trained in chunks, or partial_fit)".format(
+                    self.model.__class__.__name__
+                )
+            )
+
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+
+        return self
+
+    def _new_metrics(self):
+        """
+        Empty accumulators of the overall R² score, and of the metrics of each output feature, by name
+
+        Label outputs are measured by accuracy, and other outputs by R² score, and mean absolute error.
+        """
+
+        feature_metrics = {}
+
+        for name, feature_type in zip(self.Output._fields, self.Output):
+            if not feature_type.feature_count:
+                continue
+
+            if isinstance(feature_type, Label):
+                feature_metrics[name] = {'accuracy': Accuracy()}
+            else:
+                feature_metrics[name] = {
+                    'r2': R2Score(feature_type.feature_count),
+                    'mae': MeanAbsoluteError(feature_type.feature_count)
+                }
+
+        return R2Score(sum(feature_type.feature_count for feature_type in self.Output)), feature_metrics
+
+    def _update_metrics(self, metrics, input_array, output_array):
+        score, feature_metrics = metrics
+
+        predictions = self.model.predict(input_array).reshape(output_array.shape[0], -1)
+        score.update(output_array, predictions)
+
+        output_column_slices = self._column_slices(self.Output)
+
+        for i, (name, feature_type) in enumerate(zip(self.Output._fields, self.Output)):
+            if name not in feature_metrics:
+                continue
+
+            true_block = output_array[:, output_column_slices[i]]
+            predicted_block = predictions[:, output_column_slices[i]]
+
+            if isinstance(feature_type, Label):
+                # Decoded as by predict, so ties are broken the same way
+                feature_metrics[name]['accuracy'].update(
+                    feature_type.from_array(true_block),
+                    feature_type.from_array(predicted_block)
+                )
+            else:
+                for metric in feature_metrics[name].values():
+                    metric.update(true_block, predicted_block)
 
     @staticmethod
-    def _chunk_dataframe(dataframe, feature_types):
+    def _merge_metrics(metrics, other):
+        score, feature_metrics = metrics
+        other_score, other_feature_metrics = other
+
+        score.merge(other_score)
+
+        for name, named_metrics in feature_metrics.items():
+            for metric_name, metric in named_metrics.items():
+                metric.merge(other_feature_metrics[name][metric_name])
+
+    def _chunk_metrics(self, features):
+        metrics = self._new_metrics()
+        self._update_metrics(metrics, *self._arrays_from_features(features, self.input_statistics))
+
+        return metrics
+
+    def _stream_metrics(self, features, chunk_size, workers):
+        """
+        Accumulate the metrics of input/output pairs, or a FeatureStore, chunk_size at a time
+
+        Only the accumulators are kept between chunks, so memory used does not grow with the number of features.
+        """
+
+        metrics = self._new_metrics()
+
+        if isinstance(features, FeatureStore):
+            features.check_layout(self.__class__)
+            features.check_input_statistics(self.input_statistics)
+
+            for start in range(0, len(features), chunk_size):
+                self._update_metrics(
+                    metrics,
+                    features.input_array[start:start + chunk_size],
+                    features.output_array[start:start + chunk_size]
+                )
+
+            return metrics
+
+        if workers is None:
+            results = map(self._chunk_metrics, chunks(features, chunk_size))
+        else:
+            results = parallel_map(
+                partial(_chunk_metrics, self),
+                (
+                    [(tuple(input_), tuple(output)) for input_, output in chunk]
+                    for chunk in chunks(features, chunk_size)
+                ),
+                workers,
+                preserve_order=False
+            )
+
+        for chunk_metrics in results:
+            self._merge_metrics(metrics, chunk_metrics)
+
+        return metrics
+
+    def score(self, features, memory_limit=None, chunk_size=None, workers=None):
+        """
+        Score the model on input/output pairs, or a FeatureStore, as for the score method of the underlying model
+
+        If chunk_size, or workers, are given, score regression models in a single pass over the features,
+        accumulating their R² score chunk_size at a time, so memory used does not grow with the number of features.
+        """
+
+        if memory_limit is not None and chunk_size is None:
+            if R2Score.can_score(self.model):
+                # Score the features in chunks that fit within the memory limit
+                chunk_size = self._rows_within(memory_limit)
+            else:
+                # Fail before all features are read, if they would not fit
+                features = self._features_within(features, memory_limit)
+
+        if chunk_size is None and workers is None:
+            if not (isinstance(features, FeatureStore) and R2Score.can_score(self.model)):
+                return self.model.score(*self._raw_features(features))
+
+            # Stores are read a chunk at a time, rather than copied whole into memory, where possible
+            chunk_size = 10000
+
+        if not R2Score.can_score(self.model):
+            raise TypeError(
+                "May not score a {} in chunks (expected a regressor)".format(self.model.__class__.__name__)
+            )
+
+        score, feature_metrics = self._stream_metrics(features, chunk_size or 10000, workers)
+
+        return score.result()
+
+    def evaluate(self, features, chunk_size=10000, workers=None):
+        """
+        Metrics of the model on input/output pairs, or a FeatureStore, as a dict of dicts of metrics by feature name
+
+        Label outputs are measured by 'accuracy', and other outputs by 'r2' score, and 'mae' (mean absolute error).
+        Features are evaluated in a single pass, chunk_size at a time, optionally in worker processes.
+        """
+
+        score, feature_metrics = self._stream_metrics(features, chunk_size, workers)
+
+        return {
+            name: {metric_name: metric.result() for metric_name, metric in named_metrics.items()}
+            for name, named_metrics in feature_metrics.items()
+        }
+
+    @staticmethod
+    def _chunk_array(array, feature_types):
         start = 0
         for feature_type in feature_types:
-            chunk = dataframe.loc[:, start:start + feature_type.feature_count - 1]
-            chunk.columns = range(len(chunk.columns))
-
-            yield chunk, feature_type
+            yield array[:, start:start + feature_type.feature_count], feature_type
             start += feature_type.feature_count
 
-    def predict(self, input_features, yield_inputs=False):
-        input_features_dataframe = DataFrame(input_features)
+    def _predict_columns(self, input_features):
+        raw_features = self._to_raw_features(input_features, self.Input, self.input_statistics)
 
-        raw_features = self._to_raw_features(input_features_dataframe, self.Input)
+        raw_predictions = self.model.predict(raw_features).reshape(len(input_features), -1)
+        raw_predictions = raw_predictions.astype(self.dtype, copy=False)
 
-        raw_prediction_dataframe = DataFrame(self.model.predict(raw_features))
+        return [
+            feature_type.from_array(chunk)
+            for chunk, feature_type in self._chunk_array(raw_predictions, self.Output)
+        ]
 
-        # Using frame_apply instead of chunk.apply as chunk.apply doesn't behave as expected for 0 columns
-        prediction_dataframe = concat([
-            frame_apply(chunk, feature_type.from_series, axis=1).apply_standard()
-            for chunk, feature_type in self._chunk_dataframe(raw_prediction_dataframe, self.Output)
-        ], axis=1)
+    def predict_columns(self, input_features):
+        """
+        Predict the outputs for a given iterable of inputs, as an Output of arrays, one per output feature
+        """
+        return self.Output(*self._predict_columns(list(input_features)))
 
-        if yield_inputs:
-            for (_, input_series), (_, output_series) in zip(
-                input_features_dataframe.iterrows(),
-                prediction_dataframe.iterrows()
-            ):
-                yield self.Input(*input_series), self.Output(*output_series)
+    def predict_array(self, input_features):
+        """
+        Predict the outputs for a given iterable of inputs, as a 2D array, with one column per output feature
+        """
+        return column_stack(self._predict_columns(list(input_features)))
+
+    def cache_predictions(self, max_size=1024, max_bytes=None, ttl=None):
+        """
+        Cache the predictions of predict, and predict_one, by input, returning the model
+
+        See PredictionCache for the parameters.
+        Inputs are compared by all features other than Tags.
+        Inputs with unhashable features are never cached.
+        """
+
+        self.prediction_cache = PredictionCache(max_size=max_size, max_bytes=max_bytes, ttl=ttl)
+
+        return self
+
+    def _cache_key(self, input_feature):
+        key = tuple(input_feature[i] for i, feature_type in self.Input._encoded_features)
+
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
+
+    def _predict_outputs(self, input_features):
+        if self.prediction_cache is None:
+            keys = [None] * len(input_features)
+            predictions = [None] * len(input_features)
         else:
-            for _, output_series in prediction_dataframe.iterrows():
-                yield self.Output(*output_series)
+            keys = [self._cache_key(input_feature) for input_feature in input_features]
+            predictions = [self.prediction_cache.get(key) if key is not None else None for key in keys]
+
+        # Only predict the inputs not already cached
+        misses = [i for i, prediction in enumerate(predictions) if prediction is None]
+
+        if misses:
+            columns = self._predict_columns([input_features[i] for i in misses])
+
+            for i, output in zip(misses, zip(*(column.tolist() for column in columns))):
+                predictions[i] = self.Output(*output)
+
+                if keys[i] is not None:
+                    self.prediction_cache.put(keys[i], predictions[i])
+
+        return predictions
+
+    def predict(self, input_features, yield_inputs=False, memory_limit=None):
+        if memory_limit is None:
+            batches = [list(input_features)]
+        else:
+            # Predict in batches that fit within the memory limit
+            batches = chunks(input_features, self._rows_within(memory_limit))
+
+        for batch in batches:
+            yield from self._batch_predictions(batch, self._predict_outputs(batch), yield_inputs)
+
+    def predict_one(self, input_feature):
+        """
+        Predict the output for a single input
+        """
+        return self._predict_outputs([input_feature])[0]
+
+    @staticmethod
+    def _batch_predictions(input_features, predictions, yield_inputs):
+        if yield_inputs:
+            return zip(input_features, predictions)
+
+        return predictions
+
+    async def apredict(self, input_features, batch_size=1000, yield_inputs=False, executor=None):
+        """
+        Asynchronous version of predict, taking an iterable, or an asynchronous iterable, of inputs
+
+        Inputs are predicted in batches of batch_size, in an executor, as they arrive.
+        Each batch is predicted while the next is read, so the event loop is never blocked on the model.
+        """
+
+        loop = get_event_loop()
+        previous = None
+
+        async for batch in async_chunks(input_features, batch_size):
+            future = loop.run_in_executor(executor, self._predict_outputs, batch)
+
+            if previous is not None:
+                previous_batch, previous_future = previous
+
+                for prediction in self._batch_predictions(previous_batch, await previous_future, yield_inputs):
+                    yield prediction
+
+            previous = batch, future
+
+        if previous is not None:
+            previous_batch, previous_future = previous
+
+            for prediction in self._batch_predictions(previous_batch, await previous_future, yield_inputs):
+                yield prediction
+
+    def predict_threaded(self, input_features, threads=None, batch_size=1000):
+        """
+        Predict the outputs for a given iterable of inputs, in batches, predicted concurrently by a pool of threads
+
+        Predictions are yielded in the same order the inputs are given.
+
+        Parameters:
+            input_features - Iterable of inputs
+            threads - Number of threads to predict with, as for ThreadPoolExecutor
+            batch_size - Number of inputs to predict in each thread at once
+
+        At most twice as many batches as threads are read ahead of the predictions yielded.
+        """
+
+        if threads is None:
+            # The default of ThreadPoolExecutor
+            threads = min(32, (cpu_count() or 1) + 4)
+
+        for predictions in parallel_map(
+            self._predict_outputs,
+            chunks(input_features, batch_size),
+            threads,
+            executor_class=ThreadPoolExecutor
+        ):
+            yield from predictions
+
+    def share(self, name=None):
+        """
+        Pickle the model into a new block of shared memory, for other processes to attach to, with Model.attach
+
+        Returns the SharedModel, which should be unlinked, or used as a context manager, once no more processes
+        will attach to it.
+
+        Parameters:
+            name - Name of the block of shared memory
+                If not given, use a random name, given by the name of the SharedModel
+        """
+        return SharedModel.create(self, name)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Load a model shared by another process, using its arrays in place, read-only, from shared memory
+        """
+
+        shared_model = SharedModel.attach(name)
+        model = shared_model.load()
+
+        # Keep the block open for as long as the model uses it
+        model.shared_model = shared_model
+
+        if not isinstance(model, cls):
+            raise TypeError(
+                "Shared model {!r} is not a {}".format(name, cls.__name__)
+            )
+
+        return model
@@ -1,6 +1,9 @@
+from math import exp, floor, log, log1p
+
 from sklearn.model_selection import train_test_split as sk_train_test_split
+from sklearn.utils import check_random_state
 
-__all__ = ["train_test_split"]
+__all__ = ["train_test_split", "Reservoir", "reservoir_sample"]
 
 
 def train_test_split(features, train_test_split_ratio=None, test_sample_count=None, random_state=None):
@@ -31,3 +34,158 @@ def train_test_split(features, train_test_split_ratio=None, test_sample_count=No
         test_size=train_test_split_ratio or test_sample_count,
         random_state=random_state
     )
+
+
+class Reservoir:
+    """
+    A uniform random sample of at most capacity items of a stream, of unknown length, in a single pass
+
+    Uses Li's Algorithm L, so only the items kept in the sample need random numbers.
+    """
+
+    def __init__(self, capacity, random_state=None):
+        self.capacity = capacity
+        self.random_state = check_random_state(random_state)
+        self.items = []
+        self.count = 0
+
+        self._weight = 1.0
+        self._skip = 0
+
+    def _random(self):
+        # In (0, 1], so its logarithm is finite
+        return 1 - self.random_state.random_sample()
+
+    def _draw_skip(self):
+        self._skip = floor(log(self._random()) / log1p(-self._weight)) if self._weight < 1 else 0
+
+    def _next_skip(self):
+        self._weight *= exp(log(self._random()) / self.capacity)
+        self._draw_skip()
+
+    def _restart_skip(self):
+        # The largest of the capacity smallest uniform keys of count items, which Algorithm L keeps as its weight
+        self._weight = self.random_state.beta(self.capacity, self.count - self.capacity + 1)
+        self._draw_skip()
+
+    def add(self, item):
+        self.count += 1
+
+        if len(self.items) < self.capacity:
+            self.items.append(item)
+
+            if len(self.items) == self.capacity:
+                if self.count == self.capacity:
+                    self._next_skip()
+                else:
+                    self._restart_skip()
+        elif self._skip:
+            self._skip -= 1
+        elif self.capacity:
+            self.items[self.random_state.randint(self.capacity)] = item
+            self._next_skip()
+
+    def resize(self, capacity):
+        """
+        Change the capacity of the reservoir, dropping a uniform random selection of items if there are too many
+
+        Items passed over may not be recovered, so a reservoir that grows is filled from the items that follow.
+        """
+
+        if capacity < len(self.items):
+            kept = sorted(self.random_state.choice(len(self.items), capacity, replace=False))
+            self.items = [self.items[i] for i in kept]
+
+        self.capacity = capacity
+
+        if capacity and len(self.items) == capacity:
+            self._restart_skip()
+
+
+def _proportional_shares(total, counts):
+    """
+    Shares of total in proportion to counts, rounded by the largest remainder, in favour of earlier counts on ties
+    """
+
+    count_total = sum(counts)
+
+    shares = [total * count // count_total for count in counts]
+    remainders = sorted(range(len(counts)), key=lambda i: -(total * counts[i] % count_total))
+
+    for i in remainders[:total - sum(shares)]:
+        shares[i] += 1
+
+    return shares
+
+
+def reservoir_sample(features, max_samples, stratify=None, strata=None, balance=False, random_state=None):
+    """
+    A uniform random sample of at most max_samples features, taken in a single pass
+
+    Parameters:
+        features - Iterable of features
+        max_samples - Maximum number of features to sample
+        stratify - Function giving the stratum of a feature
+            If given, share out max_samples between the strata in proportion to the number of features seen in each,
+            so strata are represented as in the stream.
+            Shares are reallocated as features are seen, dropping random features of strata whose share shrinks,
+            and filling the shares that grow from the features that follow.
+        strata - List of all strata, in the order they are given in the sample
+            Other strata are given after these, in the order they are first seen
+        balance - Whether to take an equal share of max_samples from each of strata instead, so strata are balanced
+        random_state - Either a numpy RandomState, or the seed to use for the PRNG
+    """
+
+    max_samples = round(max_samples)
+
+    if max_samples <= 0:
+        raise ValueError(
+            "max_samples must be strictly positive (given {})".format(max_samples)
+        )
+
+    random_state = check_random_state(random_state)
+
+    if stratify is None:
+        reservoir = Reservoir(max_samples, random_state)
+
+        for feature in features:
+            reservoir.add(feature)
+
+        return reservoir.items
+
+    if balance:
+        if strata is None:
+            raise ValueError("May only balance given strata")
+
+        strata = list(strata)
+
+        # Share out any remainder among the first strata
+        reservoirs = {
+            stratum: Reservoir(max_samples // len(strata) + (i < max_samples % len(strata)), random_state)
+            for i, stratum in enumerate(strata)
+        }
+
+        for feature in features:
+            reservoirs[stratify(feature)].add(feature)
+    else:
+        reservoirs = {stratum: Reservoir(0, random_state) for stratum in strata or ()}
+
+        for feature in features:
+            stratum = stratify(feature)
+
+            if stratum not in reservoirs:
+                reservoirs[stratum] = Reservoir(0, random_state)
+
+            shares = _proportional_shares(max_samples, [
+                reservoir.count + (key == stratum)
+                for key, reservoir in reservoirs.items()
+            ])
+
+            # Shares sum to max_samples, so at most max_samples features are held
+            for reservoir, share in zip(reservoirs.values(), shares):
+                if share != reservoir.capacity:
+                    reservoir.resize(share)
+
+            reservoirs[stratum].add(feature)
+
+    return [feature for reservoir in reservoirs.values() for feature in reservoir.items]
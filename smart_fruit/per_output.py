@@ -0,0 +1,106 @@
+from joblib import Parallel, delayed
+from numpy import hstack, unique, zeros
+from sklearn.dummy import DummyClassifier
+from sklearn.metrics import r2_score
+from sklearn.multioutput import MultiOutputRegressor
+
+from smart_fruit.feature_types import Label
+
+__all__ = ["PerOutputModel"]
+
+
+def _fit(estimator, x, y, sample_weight):
+    if sample_weight is None:
+        return estimator.fit(x, y)
+
+    return estimator.fit(x, y, sample_weight=sample_weight)
+
+
+class PerOutputModel:
+    """
+    Fits a separate estimator to the encoded columns of each output feature, in parallel
+
+    Label outputs are fit by a classifier, to the index of their label, and predict the probability of each label.
+    Other outputs are fit by a regressor to each of their columns, so regressors need only accept 1D targets.
+
+    Parameters:
+        output_types - Feature types of the output features, in order
+        regressor_factory - Callable, taking no arguments, giving a new regressor
+        classifier_factory - Callable, taking no arguments, giving a new classifier
+        n_jobs - Number of processes to fit the estimators in, as for joblib
+            If not given, fit the estimators in this process
+    """
+
+    def __init__(self, output_types, regressor_factory, classifier_factory, n_jobs=None):
+        self.output_types = list(output_types)
+        self.regressor_factory = regressor_factory
+        self.classifier_factory = classifier_factory
+        self.n_jobs = n_jobs
+
+        self.estimators = []
+
+    def _blocks(self, y):
+        start = 0
+        for feature_type in self.output_types:
+            yield feature_type, y[:, start:start + feature_type.feature_count]
+            start += feature_type.feature_count
+
+    def _new_estimator(self, feature_type, target):
+        if not isinstance(feature_type, Label):
+            if feature_type.feature_count > 1:
+                return MultiOutputRegressor(self.regressor_factory())
+
+            return self.regressor_factory()
+
+        # Classifiers may not be fit to a single class
+        if len(unique(target)) < 2:
+            return DummyClassifier(strategy='most_frequent')
+
+        return self.classifier_factory()
+
+    @staticmethod
+    def _target(feature_type, block):
+        if isinstance(feature_type, Label):
+            return block.argmax(axis=1)
+
+        if block.shape[1] == 1:
+            return block[:, 0]
+
+        return block
+
+    def fit(self, x, y, sample_weight=None):
+        targets = [
+            (feature_type, self._target(feature_type, block))
+            for feature_type, block in self._blocks(y)
+            if feature_type.feature_count
+        ]
+
+        self.estimators = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit)(self._new_estimator(feature_type, target), x, target, sample_weight)
+            for feature_type, target in targets
+        )
+
+        return self
+
+    def predict(self, x):
+        estimators = iter(self.estimators)
+        blocks = [zeros((x.shape[0], 0))]
+
+        for feature_type in self.output_types:
+            if not feature_type.feature_count:
+                continue
+
+            estimator = next(estimators)
+
+            if isinstance(feature_type, Label):
+                block = zeros((x.shape[0], feature_type.feature_count))
+                block[:, estimator.classes_] = estimator.predict_proba(x)
+            else:
+                block = estimator.predict(x).reshape(x.shape[0], -1)
+
+            blocks.append(block)
+
+        return hstack(blocks)
+
+    def score(self, x, y):
+        return r2_score(y, self.predict(x))
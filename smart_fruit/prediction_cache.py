@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from sys import getsizeof
+from threading import Lock
+from time import monotonic
+
+__all__ = ["PredictionCache"]
+
+
+def _size(value):
+    if isinstance(value, tuple):
+        return getsizeof(value) + sum(_size(item) for item in value)
+
+    return getsizeof(value)
+
+
+class PredictionCache:
+    """
+    Cache of predictions, by input, evicting the least recently used predictions first
+
+    Parameters:
+        max_size - Maximum number of predictions to keep
+        max_bytes - Maximum approximate size, in bytes, of the inputs, and predictions, kept
+        ttl - Number of seconds a prediction is kept for
+            If not given, predictions are kept until evicted by max_size, or max_bytes
+
+    Only the configuration, not the contents, of the cache is kept when it is pickled.
+    """
+
+    def __init__(self, max_size=None, max_bytes=None, ttl=None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.byte_count = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.byte_count = 0
+
+    def __getstate__(self):
+        return {'max_size': self.max_size, 'max_bytes': self.max_bytes, 'ttl': self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _remove(self, key):
+        prediction, expiry, size = self._entries.pop(key)
+        self.byte_count -= size
+
+    def get(self, key):
+        """
+        The prediction cached for key, or None if there is none
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] is not None and entry[1] <= monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+            return entry[0]
+
+    def put(self, key, prediction):
+        size = _size(key) + _size(prediction)
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (prediction, monotonic() + self.ttl if self.ttl is not None else None, size)
+            self.byte_count += size
+
+            while (
+                (self.max_size is not None and len(self._entries) > self.max_size)
+                or (self.max_bytes is not None and self.byte_count > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
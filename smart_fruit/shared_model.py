@@ -0,0 +1,132 @@
+from pickle import dumps as pickle_dumps, loads as pickle_loads
+from struct import calcsize, pack_into, unpack_from
+from sys import version_info
+
+__all__ = ["SharedModel"]
+
+_header_format = '<Q'
+_alignment = 64
+
+
+def _aligned(offset):
+    return -(-offset // _alignment) * _alignment
+
+
+def _shared_memory_class():
+    # Both shared memory, and pickling arrays out-of-band with protocol 5, are new in Python 3.8
+    if version_info < (3, 8):
+        raise ImportError("Sharing models requires Python 3.8+")
+
+    from multiprocessing.shared_memory import SharedMemory
+
+    return SharedMemory
+
+
+class SharedModel:
+    """
+    A trained model, pickled into a named block of shared memory, which other processes may attach to
+
+    The arrays of the model are pickled out-of-band, each into its own aligned region of the block,
+    so models loaded from it use the arrays in place, read-only, rather than each holding a copy.
+    Only arrays that unpickle as numpy arrays are shared: scikit-learn's decision trees, as in random forests,
+    copy their node arrays into their own memory when unpickled, so each process still holds a copy of them.
+
+    The block is laid out as the length of a header, the header, giving the offset and size of each region,
+    then the pickled model, followed by its arrays.
+    """
+
+    def __init__(self, shared_memory):
+        self.shared_memory = shared_memory
+
+    @property
+    def name(self):
+        return self.shared_memory.name
+
+    @classmethod
+    def create(cls, model, name=None):
+        """
+        Pickle a model into a new block of shared memory, named name, or a random name if not given
+        """
+
+        shared_memory_class = _shared_memory_class()
+
+        buffers = []
+        payload = pickle_dumps(model, protocol=5, buffer_callback=buffers.append)
+        sections = [memoryview(payload)] + [buffer.raw() for buffer in buffers]
+
+        layout = []
+        end = 0
+        for section in sections:
+            layout.append((end, section.nbytes))
+            end = _aligned(end + section.nbytes)
+
+        header = pickle_dumps(layout)
+        header_size = calcsize(_header_format)
+        start = _aligned(header_size + len(header))
+
+        shared_memory = shared_memory_class(name=name, create=True, size=start + end)
+        buffer = shared_memory.buf
+
+        pack_into(_header_format, buffer, 0, len(header))
+        buffer[header_size:header_size + len(header)] = header
+
+        for (offset, size), section in zip(layout, sections):
+            buffer[start + offset:start + offset + size] = section.cast('B')
+
+        del buffer
+
+        return cls(shared_memory)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Open an existing block of shared memory, leaving it to be unlinked by the process that created it
+        """
+
+        shared_memory_class = _shared_memory_class()
+
+        try:
+            shared_memory = shared_memory_class(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13, the block is tracked as if created here,
+            # which is harmless in processes sharing the resource tracker of the process that created it,
+            # ie. those started by multiprocessing, or forked, after the block is created
+            shared_memory = shared_memory_class(name=name)
+
+        return cls(shared_memory)
+
+    def load(self):
+        """
+        Unpickle the model, with its arrays read-only views of the block
+
+        The block must not be closed while the model is in use.
+        """
+
+        buffer = self.shared_memory.buf
+        header_size = calcsize(_header_format)
+
+        header_length, = unpack_from(_header_format, buffer)
+        layout = pickle_loads(buffer[header_size:header_size + header_length])
+        start = _aligned(header_size + header_length)
+
+        sections = [buffer[start + offset:start + offset + size].toreadonly() for offset, size in layout]
+
+        return pickle_loads(sections[0], buffers=sections[1:])
+
+    def close(self):
+        self.shared_memory.close()
+
+    def unlink(self):
+        """
+        Free the block, once no more processes will attach to it
+
+        Processes already attached keep their models.
+        """
+        self.shared_memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        self.unlink()
@@ -0,0 +1,327 @@
+from numpy import (
+    asarray, concatenate, cumsum, empty, float64, full, inf, isnan, maximum, minimum, nan, ones, searchsorted, sort,
+    sqrt, where, zeros
+)
+from scipy.sparse import coo_matrix, csr_matrix, hstack as sparse_hstack, issparse
+
+__all__ = ["RunningMoments", "QuantileSketch", "ColumnStatistics", "with_missing_indicators"]
+
+
+class RunningMoments:
+    """
+    Count, mean, variance, minimum, and maximum of each column of a stream of 2D blocks, ignoring missing (NaN) values
+
+    Blocks are combined using the parallel algorithm of Chan, Golub, and LeVeque,
+    which is numerically stable, and lets moments of separate streams be merged.
+    """
+
+    def __init__(self, column_count):
+        self.count = zeros(column_count, dtype=float64)
+        self.mean = zeros(column_count, dtype=float64)
+        self.m2 = zeros(column_count, dtype=float64)
+        self.minimum = full(column_count, inf)
+        self.maximum = full(column_count, -inf)
+
+    @property
+    def variance(self):
+        return where(self.count > 0, self.m2 / maximum(self.count, 1), 0)
+
+    @property
+    def standard_deviation(self):
+        return sqrt(self.variance)
+
+    def _combine(self, count, mean, m2, minimum_, maximum_):
+        total = self.count + count
+        delta = mean - self.mean
+        weight = where(total > 0, count / maximum(total, 1), 0)
+
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * weight
+        self.count = total
+        self.minimum = minimum(self.minimum, minimum_)
+        self.maximum = maximum(self.maximum, maximum_)
+
+    def update(self, block):
+        block = asarray(block, dtype=float64)
+
+        present = ~isnan(block)
+        count = present.sum(axis=0)
+        mean = where(present, block, 0).sum(axis=0) / maximum(count, 1)
+
+        self._combine(
+            count,
+            mean,
+            (where(present, block - mean, 0) ** 2).sum(axis=0),
+            where(present, block, inf).min(axis=0, initial=inf),
+            where(present, block, -inf).max(axis=0, initial=-inf)
+        )
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2, other.minimum, other.maximum)
+
+    def to_json(self):
+        return {
+            key: getattr(self, key).tolist()
+            for key in ('count', 'mean', 'm2', 'minimum', 'maximum')
+        }
+
+    @classmethod
+    def from_json(cls, json):
+        moments = cls(len(json['count']))
+
+        for key, value in json.items():
+            setattr(moments, key, asarray(value, dtype=float64))
+
+        return moments
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of a stream of numbers, in bounded memory, ignoring missing (NaN) values
+
+    A simplified KLL sketch: values are kept in levels, where each value at level h stands for 2 ** h values.
+    When a level grows beyond capacity, it is sorted, and every other value promoted to the next level.
+    Sketches of separate streams may be merged.
+    """
+
+    def __init__(self, capacity=200):
+        self.capacity = capacity
+        self.levels = [empty(0, dtype=float64)]
+        self._compactions = 0
+
+    def _compact(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self.capacity:
+                if h + 1 == len(self.levels):
+                    self.levels.append(empty(0, dtype=float64))
+
+                # Alternate which half is kept, so errors cancel out rather than accumulate
+                offset = self._compactions % 2
+                self._compactions += 1
+
+                self.levels[h + 1] = concatenate([self.levels[h + 1], sort(self.levels[h])[offset::2]])
+                self.levels[h] = empty(0, dtype=float64)
+
+            h += 1
+
+    def update(self, values):
+        values = asarray(values, dtype=float64)
+
+        self.levels[0] = concatenate([self.levels[0], values[~isnan(values)]])
+        self._compact()
+
+    def merge(self, other):
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(empty(0, dtype=float64))
+
+            self.levels[h] = concatenate([self.levels[h], level])
+
+        self._compact()
+
+    def quantile(self, q):
+        values = concatenate(self.levels)
+
+        if not len(values):
+            return nan
+
+        weights = concatenate([full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+
+        order = values.argsort()
+        cumulative_weights = cumsum(weights[order])
+
+        return values[order][min(
+            searchsorted(cumulative_weights, q * cumulative_weights[-1]),
+            len(values) - 1
+        )]
+
+    def to_json(self):
+        return {
+            'capacity': self.capacity,
+            'levels': [level.tolist() for level in self.levels]
+        }
+
+    @classmethod
+    def from_json(cls, json):
+        sketch = cls(json['capacity'])
+        sketch.levels = [asarray(level, dtype=float64) for level in json['levels']]
+
+        return sketch
+
+
+class ColumnStatistics:
+    """
+    Learns, and applies, the imputation, and scaling, of the columns of a 2D block of encoded features
+
+    Missing values are imputed before scaling, and statistics are learnt from the values that are not missing.
+
+    Parameters:
+        scales - For each column of the block, one of:
+            'standard' - Scale to zero mean, and unit variance
+            'minmax' - Scale to the range 0 to 1
+            None - Leave unscaled
+        imputes - For each column of the block, how to fill in missing (NaN) values, one of:
+            'mean' - Fill with the mean
+            'median' - Fill with the approximate median
+            None - Leave as is
+    """
+
+    scale_types = ('standard', 'minmax')
+    impute_types = ('mean', 'median')
+
+    def __init__(self, scales=None, imputes=None):
+        column_count = len(scales if scales is not None else imputes)
+
+        self.scales = list(scales) if scales is not None else [None] * column_count
+        self.imputes = list(imputes) if imputes is not None else [None] * column_count
+
+        self._check_types('scale', self.scales, self.scale_types)
+        self._check_types('impute', self.imputes, self.impute_types)
+
+        self.scaled_columns = [i for i, scale in enumerate(self.scales) if scale is not None]
+        self.imputed_columns = [i for i, impute in enumerate(self.imputes) if impute is not None]
+
+        self.moments = RunningMoments(column_count)
+        self.sketches = {i: QuantileSketch() for i, impute in enumerate(self.imputes) if impute == 'median'}
+
+    @staticmethod
+    def _check_types(name, types, valid_types):
+        for type_ in types:
+            if type_ is not None and type_ not in valid_types:
+                raise ValueError(
+                    "Unknown {} {!r} (expected one of {!r})".format(name, type_, valid_types)
+                )
+
+    def update(self, block):
+        if issparse(block):
+            block = block.toarray()
+
+        self.moments.update(block)
+
+        for i, sketch in self.sketches.items():
+            sketch.update(block[:, i])
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+
+        for i, sketch in self.sketches.items():
+            sketch.merge(other.sketches[i])
+
+    def _fill_values(self):
+        fill_values = asarray([
+            self.sketches[i].quantile(0.5) if self.imputes[i] == 'median' else self.moments.mean[i]
+            for i in self.imputed_columns
+        ], dtype=float64)
+
+        # Fill columns never seen with 0
+        return where(isnan(fill_values), 0, fill_values)
+
+    def _offset_and_scale(self):
+        standard = asarray([self.scales[i] == 'standard' for i in self.scaled_columns], dtype=bool)
+        mean, minimum_, maximum_ = (
+            array_[self.scaled_columns]
+            for array_ in (self.moments.mean, self.moments.minimum, self.moments.maximum)
+        )
+
+        offset = where(standard, mean, minimum_)
+        scale = where(standard, self.moments.standard_deviation[self.scaled_columns], maximum_ - minimum_)
+
+        # Leave constant, or unseen, columns unscaled
+        scale = where((scale > 0) & (scale < inf), scale, 1)
+        offset = where(abs(offset) < inf, offset, 0)
+
+        return offset, scale
+
+    def transform(self, block):
+        """
+        Impute, and scale, a block of features, in place where possible, returning the transformed block
+        """
+
+        if issparse(block):
+            block = block.toarray()
+
+        if self.imputed_columns:
+            imputed = block[:, self.imputed_columns]
+            block[:, self.imputed_columns] = where(isnan(imputed), self._fill_values(), imputed)
+
+        if self.scaled_columns:
+            offset, scale = self._offset_and_scale()
+            block[:, self.scaled_columns] = (block[:, self.scaled_columns] - offset) / scale
+
+        return block
+
+    def linear_transform(self):
+        """
+        The imputation, and scaling, of a block as a sparse matrix, and an offset
+
+        The matrix is applied to the block with missing values as 0, followed by a column for each imputed column,
+        which is 1 where the value is missing, and 0 otherwise.
+        """
+
+        column_count = len(self.scales)
+
+        rows = list(range(column_count)) + [column_count + k for k in range(len(self.imputed_columns))]
+        columns = list(range(column_count)) + self.imputed_columns
+        values = concatenate([ones(column_count), self._fill_values()])
+
+        scale = ones(column_count)
+        offset = zeros(column_count)
+
+        if self.scaled_columns:
+            offset_, scale_ = self._offset_and_scale()
+
+            scale[self.scaled_columns] = scale_
+            offset[self.scaled_columns] = -offset_ / scale_
+
+        matrix = coo_matrix(
+            (values / scale[columns], (rows, columns)),
+            shape=(column_count + len(self.imputed_columns), column_count)
+        )
+
+        return matrix.tocsr(), offset
+
+    def to_json(self):
+        return {
+            'scales': self.scales,
+            'imputes': self.imputes,
+            'moments': self.moments.to_json(),
+            'sketches': {i: sketch.to_json() for i, sketch in self.sketches.items()}
+        }
+
+    @classmethod
+    def from_json(cls, json):
+        statistics = cls(json['scales'], json['imputes'])
+        statistics.moments = RunningMoments.from_json(json['moments'])
+        statistics.sketches = {
+            int(i): QuantileSketch.from_json(sketch_json)
+            for i, sketch_json in json['sketches'].items()
+        }
+
+        return statistics
+
+
+def with_missing_indicators(block, columns):
+    """
+    A block, with missing values as 0, followed by a column for each of the given columns,
+    which is 1 where the value is missing, and 0 otherwise
+
+    The form of block transformed by ColumnStatistics.linear_transform
+    """
+
+    if not columns:
+        return block
+
+    if issparse(block):
+        missing = isnan(block[:, columns].toarray())
+
+        block = block.tocsr(copy=True)
+        block.data = where(isnan(block.data), 0, block.data)
+
+        return sparse_hstack([block, csr_matrix(missing, dtype=float64)], format='csr')
+
+    block = asarray(block, dtype=float64)
+
+    missing = isnan(block[:, columns])
+
+    return concatenate([where(isnan(block), 0, block), missing.astype(float64)], axis=1)
@@ -1,39 +1,443 @@
+from asyncio import get_event_loop
+from bz2 import BZ2File
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from csv import reader as csv_reader
-from itertools import chain
+from glob import glob
+from gzip import GzipFile
+from io import BufferedIOBase, BufferedReader, RawIOBase, TextIOWrapper
+from itertools import chain, islice
+from lzma import LZMAFile
 
-__all__ = ["csv_open"]
+from numpy import ascontiguousarray, empty, float64, vstack
+from scipy.sparse import hstack as sparse_hstack, issparse, vstack as sparse_vstack
 
+__all__ = [
+    "open_decompressed", "csv_open", "csv_paths", "csv_shards", "csv_read_shard", "chunks", "parallel_map",
+    "async_iter", "async_chunks", "iterate_in_executor", "object_array", "hstack_features", "vstack_features",
+    "row_keys"
+]
 
-def csv_open(file, expected_columns):
+
+buffer_size = 2 ** 20
+
+_magic_numbers = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd')
+)
+
+
+def _compression(file):
+    header = file.peek(6)[:6]
+
+    for magic_number, compression in _magic_numbers:
+        if header.startswith(magic_number):
+            return compression
+
+    return None
+
+
+def _zstd_reader(file):
+    try:
+        from zstandard import ZstdDecompressor
+    except ImportError:
+        raise ImportError("Reading zstd compressed files requires the zstandard package") from None
+
+    # The compressed file is closed by _DecompressedReader, if at all
+    return ZstdDecompressor().stream_reader(file, read_size=buffer_size, closefd=False)
+
+
+_decompressors = {
+    'gzip': lambda file: GzipFile(fileobj=file),
+    'bz2': BZ2File,
+    'xz': LZMAFile,
+    'zstd': _zstd_reader
+}
+
+
+class _DecompressedReader(BufferedReader):
+    def __init__(self, stream, file):
+        super().__init__(stream, buffer_size)
+        self.file = file
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.file.close()
+
+    def detach(self):
+        """
+        Close the decompressor, leaving the compressed file open, and return the compressed file
+        """
+        super().close()
+
+        return self.file
+
+
+def open_decompressed(file):
+    """
+    Opens a binary file, decompressing it as it is read if it is gzip, bz2, xz, or zstd compressed
+
+    The compression is detected from the first bytes of the file.
+
+    Parameters:
+        file - Path, or binary file-like object, of the file to open
+    """
+
+    given_file = file
+
+    if isinstance(file, str):
+        file = open(file, 'rb', buffering=buffer_size)
+    elif not hasattr(file, 'peek'):
+        file = BufferedReader(file, buffer_size)
+
+    try:
+        compression = _compression(file)
+
+        if compression is None:
+            return file
+
+        return _DecompressedReader(_decompressors[compression](file), file)
+    except BaseException:
+        if isinstance(given_file, str):
+            file.close()
+        else:
+            _detach_decompressed(file, given_file)
+
+        raise
+
+
+def _detach_decompressed(decompressed_file, file):
+    """
+    Separate a file given by open_decompressed from the binary file-like object it was opened with,
+    leaving that file open, where closing the decompressed file would close it
+    """
+
+    if isinstance(decompressed_file, _DecompressedReader):
+        decompressed_file = decompressed_file.detach()
+
+    if decompressed_file is not file:
+        decompressed_file.detach()
+
+
+def csv_open(file, expected_columns, required_columns=None):
     """
     Yields rows of csv file as dictionaries
 
     Parameters:
         file - Path, or file-like object, of the CSV file to use
+            Paths, and binary file-like objects, may be gzip, bz2, xz, or zstd compressed
         expected_columns - Columns of the csv file
-            If the first row of the CSV file are these labels, take the columns in that order
+            If the first row of the CSV file contains these labels, take the columns in that order, ignoring any others
             Otherwise, take the columns in the order given by expected_columns
+        required_columns - Columns that may not be missing from the ends of rows with too few columns
+            If none of these columns are missing, the missing columns are left out of the dictionary
+            Otherwise, raise an IndexError
+            If not given, no columns may be missing
     """
 
     if isinstance(file, str):
-        with open(file, encoding='utf-8') as f:
-            yield from csv_open(f, expected_columns=expected_columns)
+        with TextIOWrapper(open_decompressed(file), encoding='utf-8') as f:
+            yield from csv_open(f, expected_columns=expected_columns, required_columns=required_columns)
             return
 
+    if isinstance(file, (BufferedIOBase, RawIOBase)):
+        # Files given by the caller are left open, so are detached from, rather than closed with, their readers
+        decompressed_file = open_decompressed(file)
+        f = TextIOWrapper(decompressed_file, encoding='utf-8')
+
+        try:
+            yield from csv_open(f, expected_columns=expected_columns, required_columns=required_columns)
+        finally:
+            f.detach()
+            _detach_decompressed(decompressed_file, file)
+
+        return
+
     expected_columns = tuple(expected_columns)
 
     csv_iter = csv_reader(file)
 
     first_row = next(csv_iter)
 
-    if set(first_row) == set(expected_columns):
+    if set(expected_columns) <= set(first_row):
         columns = first_row
     else:
         columns = expected_columns
         csv_iter = chain([first_row], csv_iter)
 
-    for row in csv_iter:
-        if len(row) < len(columns):
+    yield from _csv_dicts(csv_iter, columns, required_columns)
+
+
+def _csv_dicts(rows, columns, required_columns):
+    required_columns = frozenset(columns if required_columns is None else required_columns)
+
+    for row in rows:
+        if len(row) < len(columns) and not required_columns.isdisjoint(columns[len(row):]):
             raise IndexError("Too few columns in row {!r}".format(row))
 
         yield dict(zip(columns, row))
+
+
+def csv_paths(csv_path):
+    """
+    List of CSV file paths given by a path, a glob pattern, or a list of paths
+    """
+
+    if isinstance(csv_path, str):
+        if any(character in csv_path for character in '*?['):
+            return sorted(glob(csv_path))
+
+        return [csv_path]
+
+    return list(csv_path)
+
+
+def _line_boundaries(file, start, end, split_bytes):
+    boundaries = [start]
+
+    position = start + split_bytes
+    while position < end:
+        # Move to the start of the line containing position
+        file.seek(position - 1)
+        file.readline()
+        position = file.tell()
+
+        if position >= end:
+            break
+
+        boundaries.append(position)
+        position += split_bytes
+
+    return boundaries + [end]
+
+
+def csv_shards(paths, expected_columns, split_bytes=None):
+    """
+    Yields shards of CSV files, as (path, start, end, columns) tuples, to be read by csv_read_shard
+
+    Columns are found for each file as in csv_open.
+    If split_bytes is given, split each file into byte ranges of about that size, on line boundaries.
+    Fields containing new lines may not be split in this way.
+
+    Compressed files may not be split, so are given as a single shard, whose end is None,
+    and whose start is an offset into the decompressed file.
+    """
+
+    expected_columns = tuple(expected_columns)
+
+    for path in paths:
+        with open_decompressed(path) as file:
+            first_line = file.readline()
+            first_row = next(csv_reader([first_line.decode('utf-8')]), [])
+
+            if first_row and set(expected_columns) <= set(first_row):
+                columns = tuple(first_row)
+                start = len(first_line)
+            else:
+                columns = expected_columns
+                start = 0
+
+            if isinstance(file, _DecompressedReader):
+                boundaries = [start, None]
+            else:
+                end = file.seek(0, 2)
+
+                boundaries = _line_boundaries(file, start, end, split_bytes) if split_bytes else [start, end]
+
+        for shard_start, shard_end in zip(boundaries, boundaries[1:]):
+            yield path, shard_start, shard_end, columns
+
+
+def _lines(file, byte_count):
+    for line in file:
+        yield line.decode('utf-8')
+
+        byte_count -= len(line)
+        if byte_count <= 0:
+            return
+
+
+def csv_read_shard(path, start, end, columns, required_columns=None):
+    """
+    Yields rows of a shard of a CSV file, given by csv_shards, as dictionaries
+
+    Rows with too few columns raise an IndexError, unless none of required_columns are missing, as in csv_open
+    """
+
+    if end is not None and start >= end:
+        return
+
+    with open_decompressed(path) as file:
+        if end is None:
+            # Compressed files may only be read from the start
+            file.read(start)
+            lines = (line.decode('utf-8') for line in file)
+        else:
+            file.seek(start)
+            lines = _lines(file, end - start)
+
+        yield from _csv_dicts(csv_reader(lines), columns, required_columns)
+
+
+def chunks(iterable, chunk_size):
+    """
+    Yields successive lists of at most chunk_size items from iterable
+    """
+
+    iterator = iter(iterable)
+
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def parallel_map(func, items, workers, preserve_order=True, executor_class=ProcessPoolExecutor):
+    """
+    Yields func applied to each of items, computed in a pool of worker processes, or of executor_class
+
+    At most twice as many items as workers are in progress at once, so results are never far ahead of the consumer.
+    If preserve_order, yield results in the same order as items, otherwise as soon as they are ready.
+    """
+
+    items = iter(items)
+
+    with executor_class(workers) as executor:
+        pending = deque(executor.submit(func, item) for item in islice(items, 2 * workers))
+
+        while pending:
+            if preserve_order:
+                future = pending.popleft()
+            else:
+                future = wait(pending, return_when=FIRST_COMPLETED).done.pop()
+                pending.remove(future)
+
+            yield future.result()
+
+            for item in islice(items, 1):
+                pending.append(executor.submit(func, item))
+
+
+async def async_iter(iterable):
+    """
+    Yields the items of an iterable, or an asynchronous iterable, asynchronously
+    """
+
+    if hasattr(iterable, '__aiter__'):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+async def async_chunks(iterable, chunk_size):
+    """
+    Yields successive lists of at most chunk_size items from an iterable, or an asynchronous iterable
+    """
+
+    chunk = []
+
+    async for item in async_iter(iterable):
+        chunk.append(item)
+
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+async def iterate_in_executor(iterable, chunk_size, executor=None):
+    """
+    Yields the items of a blocking iterable asynchronously, reading chunk_size items at a time in an executor
+    """
+
+    iterator = iter(iterable)
+    loop = get_event_loop()
+
+    while True:
+        chunk = await loop.run_in_executor(executor, list, islice(iterator, chunk_size))
+
+        if not chunk:
+            return
+
+        for item in chunk:
+            yield item
+
+
+def object_array(values):
+    """
+    Creates a 1D numpy object array from an iterable, without unpacking any tuple values
+    """
+
+    values = list(values)
+
+    result = empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        result[i] = value
+
+    return result
+
+
+def hstack_features(blocks, row_count, dtype=float64):
+    """
+    Stacks 2D blocks of encoded features side by side, as dtype
+
+    Gives a sparse CSR matrix if any of the blocks are sparse, and a dense array otherwise
+    """
+
+    blocks = [block for block in blocks if block.shape[1]]
+
+    if any(issparse(block) for block in blocks):
+        return sparse_hstack(blocks, format='csr', dtype=dtype)
+
+    # Copy each block straight into the result, so narrower blocks are never widened first
+    features = empty((row_count, sum(block.shape[1] for block in blocks)), dtype=dtype)
+
+    start = 0
+    for block in blocks:
+        features[:, start:start + block.shape[1]] = block
+        start += block.shape[1]
+
+    return features
+
+
+def vstack_features(blocks, dtype=float64):
+    """
+    Stacks 2D blocks of encoded features one above the other, as dtype
+
+    Gives a sparse CSR matrix if any of the blocks are sparse, and a dense array otherwise
+    """
+
+    if any(issparse(block) for block in blocks):
+        return sparse_vstack(blocks, format='csr', dtype=dtype)
+
+    return vstack(blocks).astype(dtype, copy=False)
+
+
+def _block_row_keys(block):
+    if issparse(block):
+        block = block.tocsr()
+        block.sum_duplicates()
+
+        for start, end in zip(block.indptr, block.indptr[1:]):
+            yield block.indices[start:end].tobytes() + block.data[start:end].tobytes()
+    else:
+        for row in ascontiguousarray(block, dtype=float64):
+            yield row.tobytes()
+
+
+def row_keys(*blocks):
+    """
+    Yields a hashable key for each row of the given 2D blocks, taken together, equal only for equal rows
+    """
+    return zip(*(_block_row_keys(block) for block in blocks))
@@ -0,0 +1,96 @@
+from unittest import TestCase
+
+from numpy import array, int64, ndarray
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Array, Number, Vector
+
+
+class TestArrayTypes(TestCase):
+    def test_array(self):
+        class ExampleModel(Model):
+            class Input:
+                a = Number()
+
+            class Output:
+                b = Array((2, 3))
+
+        samples = [
+            (0, [[0, 1, 2], [3, 4, 5]]),
+            (1, [[10, 11, 12], [13, 14, 15]])
+        ]
+
+        model = ExampleModel.train(ExampleModel.features_from_list(samples))
+
+        predictions = model.predict(ExampleModel.input_features_from_list([[0], [1]]))
+
+        for (sample_input, sample_output), prediction in zip(samples, predictions):
+            with self.subTest(sample=sample_input):
+                self.assertIsInstance(prediction.b, ndarray)
+                self.assertEqual(prediction.b.shape, (2, 3))
+                self.assertTrue(abs(prediction.b - sample_output).max() < 1e-9)
+
+    def test_array_input(self):
+        class ExampleModel(Model):
+            class Input:
+                a = Array(4)
+
+            class Output:
+                b = Number()
+
+        samples = [
+            ([n, 2 * n, 0, 1], 3 * n)
+            for n in range(5)
+        ]
+
+        model = ExampleModel.train(ExampleModel.features_from_list(samples))
+
+        predictions = model.predict(ExampleModel.input_features_from_list([sample[:1] for sample in samples]))
+
+        for (sample_input, sample_output), prediction in zip(samples, predictions):
+            with self.subTest(sample=sample_input):
+                self.assertAlmostEqual(prediction.b, sample_output)
+
+    def test_array_in_vector(self):
+        feature_type = Vector([Number(), Array(2, dtype=int64)])
+
+        features = feature_type.to_array([(1, array([2, 3])), (4, array([5, 6]))])
+
+        self.assertEqual(features.tolist(), [[1, 2, 3], [4, 5, 6]])
+
+        values = feature_type.from_array(features)
+
+        self.assertEqual(values[1][0], 4)
+        self.assertEqual(values[1][1].tolist(), [5, 6])
+        self.assertEqual(values[1][1].dtype, int64)
+
+    def test_array_views(self):
+        feature_type = Array(2)
+
+        values = feature_type.from_array(array([[1., 2.], [3., 4.]]))
+
+        self.assertIs(values[0].base, values[1].base)
+
+    def test_array_validation(self):
+        feature_type = Array(3)
+
+        for a in ([0, 1, 2], (3.5, -1, 17), array([1, 2, 3])):
+            with self.subTest(a=a):
+                self.assertEqual(feature_type.validate(a).tolist(), list(a))
+
+        for a in ([0, 1], [[0, 1, 2]], [0, 1, float("nan")], [0, 1, float("inf")], ["a", "b", "c"]):
+            with self.subTest(a=a), \
+                 self.assertRaises((TypeError, ValueError)):
+                feature_type.validate(a)
+
+        with self.assertRaises(TypeError):
+            Array(3, dtype=complex)
+
+    def test_integer_validation(self):
+        value = Array(4, dtype=int64).validate([1.7, -1.7, 2.5, 0.2])
+
+        self.assertEqual(value.dtype, int64)
+        self.assertEqual(value.tolist(), [2, -2, 2, 0])
+
+        with self.assertRaises(ValueError):
+            Array(2, dtype=int64).validate([1, float("inf")])
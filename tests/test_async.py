@@ -0,0 +1,80 @@
+from asyncio import new_event_loop, sleep
+from io import StringIO
+from unittest import TestCase
+
+from numpy import allclose
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Label, Number
+
+
+class AsyncModel(Model):
+    class Input:
+        a = Number()
+        b = Label(['x', 'y'])
+
+    class Output:
+        c = Number()
+
+
+async def _async_list(async_iterable):
+    return [item async for item in async_iterable]
+
+
+async def _slow_json(samples):
+    for a, b, c in samples:
+        await sleep(0)
+        yield {'a': a, 'b': b, 'c': c}
+
+
+class TestAsync(TestCase):
+    samples = [(a, 'xy'[a % 2], 2 * a + 10 * (a % 2)) for a in range(25)]
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        self.model = AsyncModel.train(AsyncModel.features_from_list(self.samples))
+        self.inputs = [input_ for input_, output in AsyncModel.features_from_list(self.samples)]
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _run(self, async_iterable):
+        return self.loop.run_until_complete(_async_list(async_iterable))
+
+    def test_apredict(self):
+        expected_predictions = list(self.model.predict(self.inputs))
+
+        for batch_size in (1, 4, 100):
+            with self.subTest(batch_size=batch_size):
+                predictions = self._run(self.model.apredict(
+                    AsyncModel.ainput_features_from_json(_slow_json(self.samples)),
+                    batch_size=batch_size
+                ))
+
+                self.assertIsInstance(predictions[0], AsyncModel.Output)
+                self.assertTrue(allclose(predictions, expected_predictions))
+
+    def test_apredict_yield_inputs(self):
+        self.assertEqual(
+            self._run(self.model.apredict(self.inputs, batch_size=7, yield_inputs=True)),
+            list(self.model.predict(self.inputs, yield_inputs=True))
+        )
+
+    def test_async_json(self):
+        self.assertEqual(
+            self._run(AsyncModel.afeatures_from_json(_slow_json(self.samples))),
+            list(AsyncModel.features_from_list(self.samples))
+        )
+
+    def test_async_csv(self):
+        csv_contents = "".join("{},{},{}\n".format(*sample) for sample in self.samples)
+
+        self.assertEqual(
+            self._run(AsyncModel.afeatures_from_csv(StringIO(csv_contents), chunk_size=4)),
+            list(AsyncModel.features_from_list(self.samples))
+        )
+
+        self.assertEqual(
+            self._run(AsyncModel.ainput_features_from_csv(StringIO(csv_contents), chunk_size=4)),
+            self.inputs
+        )
@@ -0,0 +1,99 @@
+from unittest import TestCase
+
+from numpy import ndarray
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Number, Integer, Complex, Label, Vector
+
+
+class TestBulkPrediction(TestCase):
+    class ExampleModel(Model):
+        class Input:
+            a = Number()
+            b = Number()
+
+        class Output:
+            c = Number()
+            d = Integer()
+            e = Label(['a', 'b'])
+            f = Complex()
+            g = Vector([Number(), Label(['x', 'y'])])
+
+    samples = [
+        (0, 0, 0, 0, 'a', 0, (0, 'x')),
+        (0, 1, 0, 3, 'b', 1j, (1, 'y')),
+        (1, 0, 2, 0, 'a', 1, (2, 'x')),
+        (1, 1, 2, 3, 'b', 1 + 1j, (3, 'y'))
+    ]
+
+    def setUp(self):
+        self.model = self.ExampleModel.train(self.ExampleModel.features_from_list(self.samples))
+        self.inputs = list(self.ExampleModel.input_features_from_list(sample[:2] for sample in self.samples))
+
+    def test_predict_columns(self):
+        columns = self.model.predict_columns(self.inputs)
+
+        self.assertIsInstance(columns, self.ExampleModel.Output)
+
+        for column in columns:
+            self.assertIsInstance(column, ndarray)
+            self.assertEqual(len(column), len(self.samples))
+
+        for i, sample in enumerate(self.samples):
+            with self.subTest(sample=sample):
+                self.assertAlmostEqual(columns.c[i], sample[2])
+                self.assertEqual(columns.d[i], sample[3])
+                self.assertEqual(columns.e[i], sample[4])
+                self.assertAlmostEqual(columns.f[i], sample[5])
+                self.assertAlmostEqual(columns.g[i][0], sample[6][0])
+                self.assertEqual(columns.g[i][1], sample[6][1])
+
+    def test_predict_array(self):
+        predictions = self.model.predict_array(self.inputs)
+
+        self.assertEqual(predictions.shape, (len(self.samples), len(self.ExampleModel.Output)))
+
+        for row, sample in zip(predictions, self.samples):
+            with self.subTest(sample=sample):
+                self.assertAlmostEqual(row[0], sample[2])
+                self.assertEqual(row[2], sample[4])
+
+    def test_matches_predict(self):
+        columns = self.model.predict_columns(self.inputs)
+
+        for i, prediction in enumerate(self.model.predict(self.inputs)):
+            with self.subTest(i=i):
+                self.assertEqual(prediction, self.ExampleModel.Output(*(column[i] for column in columns)))
+
+    def test_series_overrides(self):
+        class Doubled(Number):
+            def to_series(self, value):
+                return super().to_series(2 * value)
+
+            def from_series(self, features):
+                return super().from_series(features) / 2
+
+        class Rounded(Integer):
+            def from_series(self, features):
+                return 10 * round(super().from_series(features) / 10)
+
+        class SeriesModel(Model):
+            class Input:
+                a = Doubled()
+
+            class Output:
+                b = Doubled()
+                c = Rounded()
+
+        features = list(SeriesModel.features_from_list([(n, 3 * n, 3 * n) for n in range(5)]))
+        model = SeriesModel.train(features)
+
+        input_array, output_array = SeriesModel._arrays_from_features(features)
+
+        self.assertEqual(input_array[:, 0].tolist(), [2 * n for n in range(5)])
+        self.assertEqual(output_array[:, 0].tolist(), [6 * n for n in range(5)])
+
+        columns = model.predict_columns(input_ for input_, output in features)
+
+        self.assertEqual([round(b) for b in columns.b], [3 * n for n in range(5)])
+        self.assertEqual(list(columns.c), [0, 0, 10, 10, 10])
@@ -0,0 +1,110 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import allclose
+from numpy.random import RandomState
+from sklearn import tree
+
+from smart_fruit import FeatureStore, Model
+from smart_fruit.feature_types import Label, Number, Optional, Text, Vector
+
+
+class ChunkedModel(Model):
+    # Defined at module level, so it may be sent to worker processes
+    class Input:
+        a = Number(scale='standard')
+        b = Optional(Number(scale='minmax'), impute='median', indicator=True)
+        c = Label(['x', 'y', 'z'])
+        d = Vector([Optional(Number()), Number()])
+        e = Text(n_features=16)
+
+    class Output:
+        f = Number()
+        g = Number()
+
+
+class TestChunkedTraining(TestCase):
+    def setUp(self):
+        random_state = RandomState(0)
+
+        self.samples = []
+        for i in range(60):
+            a, b, d, d_2 = random_state.normal(size=4)
+            c = random_state.randint(3)
+
+            b = None if i % 4 == 0 else 10 * b
+            d = None if i % 5 == 0 else d
+
+            self.samples.append((
+                a, b, 'xyz'[c], (d, d_2), ' '.join('abc'[:c + 1]),
+                2 * a + (b or 0) - c + random_state.normal(), a - (d or 0) + d_2
+            ))
+
+        self.features = list(ChunkedModel.features_from_list(self.samples))
+        self.inputs = [input_ for input_, output in self.features]
+
+    def _check_same_model(self, model, expected_model):
+        self.assertTrue(allclose(model.model.coef_, expected_model.model.coef_))
+        self.assertTrue(allclose(model.model.intercept_, expected_model.model.intercept_))
+        self.assertTrue(allclose(model.predict_array(self.inputs), expected_model.predict_array(self.inputs)))
+
+        self.assertEqual(
+            {i: field_statistics.to_json()['imputes'] for i, field_statistics in model.input_statistics.items()},
+            {i: field_statistics.to_json()['imputes'] for i, field_statistics in expected_model.input_statistics.items()}
+        )
+
+        for i, field_statistics in model.input_statistics.items():
+            self.assertTrue(allclose(field_statistics.moments.mean, expected_model.input_statistics[i].moments.mean))
+
+    def test_chunks(self):
+        expected_model = ChunkedModel.train(self.features)
+
+        for chunk_size in (1, 7, 100):
+            with self.subTest(chunk_size=chunk_size):
+                self._check_same_model(ChunkedModel.train(self.features, chunk_size=chunk_size), expected_model)
+
+    def test_workers(self):
+        self._check_same_model(
+            ChunkedModel.train(iter(self.features), chunk_size=7, workers=2),
+            ChunkedModel.train(self.features)
+        )
+
+    def test_feature_store(self):
+        # Stores are dense, so may not hold Text features
+        class DenseModel(Model):
+            class Input:
+                a = Number(scale='standard')
+                b = Optional(Number(scale='minmax'), impute='median', indicator=True)
+                c = Label(['x', 'y', 'z'])
+                d = Vector([Optional(Number()), Number()])
+
+            class Output:
+                f = Number()
+                g = Number()
+
+        features = list(DenseModel.features_from_list(sample[:4] + sample[5:] for sample in self.samples))
+        self.inputs = [input_ for input_, output in features]
+
+        with TemporaryDirectory() as store_path:
+            store = FeatureStore.create(store_path, DenseModel, features)
+
+            self._check_same_model(DenseModel.train(store, chunk_size=7), DenseModel.train(features))
+
+            del store
+
+    def test_update(self):
+        model = ChunkedModel.train(self.features[:40], chunk_size=7)
+        model.update(self.features[40:])
+
+        expected_model = ChunkedModel()
+        expected_model.input_statistics = model.input_statistics
+        expected_model.model.fit(*expected_model._raw_features(self.features))
+
+        self.assertTrue(allclose(model.model.coef_, expected_model.model.coef_))
+
+    def test_not_linear_regression(self):
+        class TreeModel(ChunkedModel):
+            model_class = tree.DecisionTreeRegressor
+
+        with self.assertRaises(TypeError):
+            TreeModel.train(self.features, chunk_size=7)
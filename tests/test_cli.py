@@ -0,0 +1,104 @@
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from json import loads as json_loads
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from smart_fruit import Model
+from smart_fruit.cli import load_schema, main
+from smart_fruit.feature_types import Complex, Number
+
+schema = 'examples.trivial_model:TrivialModel'
+
+
+class ComplexModel(Model):
+    class Input:
+        a = Number()
+
+    class Output:
+        b = Complex()
+
+
+class TestCLI(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        self.data_path = self._path('data.csv')
+        self.inputs_path = self._path('inputs.csv')
+        self.model_path = self._path('model.pickle')
+
+        with open(self.data_path, 'w', encoding='utf-8') as data_file:
+            data_file.write("output,input_\n")
+            data_file.writelines("{},{}\n".format(10 * n, n) for n in range(20))
+
+        with open(self.inputs_path, 'w', encoding='utf-8') as inputs_file:
+            inputs_file.writelines("{}\n".format(n) for n in (3, 6, 9))
+
+        self._main('train', schema, self.data_path, self.model_path)
+
+    def _path(self, name):
+        return path.join(self.directory.name, name)
+
+    @staticmethod
+    def _main(*argv):
+        output = StringIO()
+
+        with redirect_stdout(output), redirect_stderr(StringIO()):
+            main(list(argv))
+
+        return output.getvalue()
+
+    def test_load_schema(self):
+        self.assertEqual(load_schema(schema).__name__, 'TrivialModel')
+
+        with self.assertRaises(ValueError):
+            load_schema('examples.trivial_model')
+
+    def test_score(self):
+        self.assertAlmostEqual(float(self._main('score', schema, self.model_path, self.data_path)), 1)
+
+    def test_predict_csv(self):
+        rows = self._main('predict', schema, self.model_path, self.inputs_path, '--batch-size', '2').splitlines()
+
+        self.assertEqual(rows[0], 'output')
+        self.assertEqual([round(float(row)) for row in rows[1:]], [30, 60, 90])
+
+    def test_predict_json_lines(self):
+        output_path = self._path('predictions.jsonl')
+
+        self._main('predict', schema, self.model_path, self.inputs_path, '--output', output_path, '--yield-inputs')
+
+        with open(output_path, encoding='utf-8') as output_file:
+            predictions = [json_loads(line) for line in output_file]
+
+        self.assertEqual([prediction['input_'] for prediction in predictions], [3, 6, 9])
+        self.assertEqual([round(prediction['output']) for prediction in predictions], [30, 60, 90])
+
+    def test_predict_extra_columns(self):
+        rows = self._main('predict', schema, self.model_path, self.data_path).splitlines()
+
+        self.assertEqual([round(float(row)) for row in rows[1:]], [10 * n for n in range(20)])
+
+    def test_predict_complex_json_lines(self):
+        complex_schema = 'tests.test_cli:ComplexModel'
+        complex_data_path = self._path('complex_data.csv')
+        complex_model_path = self._path('complex_model.pickle')
+        output_path = self._path('complex_predictions.jsonl')
+
+        with open(complex_data_path, 'w', encoding='utf-8') as data_file:
+            data_file.write("a,b\n")
+            data_file.writelines("{},{}\n".format(n, complex(n, -2 * n)) for n in range(10))
+
+        self._main('train', complex_schema, complex_data_path, complex_model_path)
+        self._main('predict', complex_schema, complex_model_path, self.inputs_path, '--output', output_path)
+
+        with open(output_path, encoding='utf-8') as output_file:
+            predictions = [json_loads(line)['b'] for line in output_file]
+
+        # Complex values are written as [real, imag]
+        self.assertEqual(
+            [[round(part) for part in prediction] for prediction in predictions],
+            [[3, -6], [6, -12], [9, -18]]
+        )
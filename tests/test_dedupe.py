@@ -0,0 +1,97 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import allclose
+from sklearn import neighbors, tree
+
+from smart_fruit import FeatureStore, Model
+from smart_fruit.feature_types import Label, Number, Optional, Text
+
+
+class DedupeModel(Model):
+    class Input:
+        a = Number(scale='standard')
+        b = Optional(Number(), impute='median')
+        c = Label(['x', 'y', 'z'])
+
+    class Output:
+        d = Number()
+
+
+class TestDedupe(TestCase):
+    distinct_samples = [
+        (a, b, 'xyz'[(a + 1) % 3], 3 * a - 2 * (b or 0) + (a + 1) % 3)
+        for a in range(5)
+        for b in (None, 1, 2)
+    ]
+
+    def setUp(self):
+        # Repeat each sample a different number of times
+        self.samples = [sample for i, sample in enumerate(self.distinct_samples) for _ in range(i % 4 + 1)]
+        self.features = list(DedupeModel.features_from_list(self.samples))
+        self.inputs = [input_ for input_, output in self.features]
+
+    def test_deduplicated_features(self):
+        model = DedupeModel()
+
+        input_array, output_array, sample_weight = model._deduplicated_features(self.features, chunk_size=7)
+
+        self.assertEqual(input_array.shape[0], len(self.distinct_samples))
+        self.assertEqual(output_array.shape[0], len(self.distinct_samples))
+        self.assertEqual(sample_weight.tolist(), [i % 4 + 1 for i in range(len(self.distinct_samples))])
+
+    def test_same_model(self):
+        model = DedupeModel.train(self.features, dedupe=True)
+        expected_model = DedupeModel.train(self.features)
+
+        self.assertTrue(allclose(model.model.coef_, expected_model.model.coef_))
+        self.assertTrue(allclose(model.model.intercept_, expected_model.model.intercept_))
+
+        for i, field_statistics in model.input_statistics.items():
+            self.assertEqual(field_statistics.to_json(), expected_model.input_statistics[i].to_json())
+
+    def test_sample_weight_estimator(self):
+        class TreeModel(DedupeModel):
+            model_class = tree.DecisionTreeRegressor
+
+        model = TreeModel.train(self.features, dedupe=True)
+
+        self.assertEqual(model.model.tree_.weighted_n_node_samples[0], len(self.samples))
+        self.assertTrue(allclose(
+            model.predict_array(self.inputs),
+            TreeModel.train(self.features).predict_array(self.inputs)
+        ))
+
+    def test_no_sample_weight(self):
+        class NeighboursModel(DedupeModel):
+            model_class = neighbors.KNeighborsRegressor
+
+        with self.assertRaises(TypeError):
+            NeighboursModel.train(self.features, dedupe=True)
+
+    def test_sparse_features(self):
+        class TextModel(Model):
+            class Input:
+                a = Text(n_features=32)
+
+            class Output:
+                b = Number()
+
+        features = list(TextModel.features_from_list(
+            [('a b', 1), ('b c', 2), ('a b', 1), ('c', 3), ('b c', 2), ('a b', 1)]
+        ))
+
+        input_array, output_array, sample_weight = TextModel()._deduplicated_features(features)
+
+        self.assertEqual(input_array.shape[0], 3)
+        self.assertEqual(sample_weight.tolist(), [3, 2, 1])
+
+    def test_feature_store(self):
+        with TemporaryDirectory() as store_path:
+            store = FeatureStore.create(store_path, DedupeModel, self.features)
+
+            model = DedupeModel.train(store, dedupe=True)
+
+            self.assertTrue(allclose(model.model.coef_, DedupeModel.train(store).model.coef_))
+
+            del store, model
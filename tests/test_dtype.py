@@ -0,0 +1,124 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import allclose, array, float32, float64, uint8
+from scipy.sparse import issparse
+
+from smart_fruit import FeatureStore, Model
+from smart_fruit.feature_types import Array, HashedLabel, Label, Number, Optional, Vector
+
+
+class Float64Model(Model):
+    class Input:
+        a = Number(scale='standard')
+        b = Label(['x', 'y', 'z'])
+        c = Vector([Number(), Optional(Number(), indicator=True)])
+
+    class Output:
+        d = Number()
+        e = Label(['p', 'q'])
+
+
+class Float32Model(Float64Model):
+    dtype = float32
+
+
+class TestDtype(TestCase):
+    samples = [(n, 'xyz'[n % 3], (n / 2, n % 4 or None), 3 * n - n % 3, 'pq'[n % 2]) for n in range(30)]
+
+    def setUp(self):
+        self.features = list(Float32Model.features_from_list(self.samples))
+        self.inputs = [input_ for input_, output in self.features]
+
+    def test_label_blocks(self):
+        block = Label(['x', 'y', 'z']).to_array(['y', 'x'])
+
+        self.assertEqual(block.dtype, uint8)
+        self.assertEqual(block.tolist(), [[0, 1, 0], [1, 0, 0]])
+
+    def test_array_blocks(self):
+        class EmbeddingModel(Model):
+            dtype = float32
+
+            class Input:
+                a = Array(3, dtype=float32)
+
+            class Output:
+                b = Number()
+
+        block = EmbeddingModel.Input.a.to_array([array([1, 2, 3], dtype=float32)])
+
+        # Left as float32, rather than widened to float64 before stacking
+        self.assertEqual(block.dtype, float32)
+        self.assertEqual(EmbeddingModel.Input.a.encoded_bytes(), 12)
+
+        input_array, output_array = EmbeddingModel._arrays_from_features(
+            EmbeddingModel.features_from_list([([1, 2, 3], 4), ([5, 6, 7], 8)])
+        )
+
+        self.assertEqual(input_array.dtype, float32)
+        self.assertEqual(input_array.tolist(), [[1, 2, 3], [5, 6, 7]])
+
+    def test_encoded_arrays(self):
+        for model_class, dtype in ((Float64Model, float64), (Float32Model, float32)):
+            with self.subTest(dtype=dtype.__name__):
+                input_array, output_array = model_class._arrays_from_features(self.features)
+
+                self.assertEqual(input_array.dtype, dtype)
+                self.assertEqual(output_array.dtype, dtype)
+
+    def test_sparse_blocks(self):
+        class SparseModel(Model):
+            dtype = float32
+
+            class Input:
+                a = HashedLabel(16)
+                b = Number()
+
+            class Output:
+                c = Number()
+
+        input_array, output_array = SparseModel._arrays_from_features(
+            SparseModel.features_from_list([('x', 1, 2), ('y', 3, 4)])
+        )
+
+        self.assertTrue(issparse(input_array))
+        self.assertEqual(input_array.dtype, float32)
+
+    def test_train_and_predict(self):
+        model = Float32Model.train(self.features)
+        expected_model = Float64Model.train(self.features)
+
+        predictions = model.predict_columns(self.inputs)
+
+        self.assertEqual(predictions.d.dtype, float32)
+        self.assertTrue(allclose(predictions.d, expected_model.predict_columns(self.inputs).d, atol=1e-3))
+        self.assertEqual(list(predictions.e), list(expected_model.predict_columns(self.inputs).e))
+
+    def test_chunked_training(self):
+        self.assertTrue(allclose(
+            Float32Model.train(self.features, chunk_size=7).model.coef_,
+            Float64Model.train(self.features).model.coef_,
+            atol=1e-3
+        ))
+
+    def test_dedupe(self):
+        self.assertTrue(allclose(
+            Float32Model.train(self.features + self.features, dedupe=True).model.coef_,
+            Float64Model.train(self.features).model.coef_,
+            atol=1e-3
+        ))
+
+    def test_feature_store(self):
+        with TemporaryDirectory() as store_path:
+            store = FeatureStore.create(store_path, Float32Model, self.features)
+
+            self.assertEqual(store.input_array.dtype, float32)
+            self.assertEqual(store.output_array.dtype, float32)
+
+            model = Float32Model.train(store)
+
+            self.assertAlmostEqual(model.score(store), model.score(self.features), places=4)
+
+            del store, model
+
@@ -0,0 +1,118 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from numpy import memmap
+from sklearn import tree
+
+from smart_fruit import FeatureStore, Model
+from smart_fruit.feature_types import Number, Label, Text
+
+from examples.trivial_model import TrivialModel
+
+
+class TestFeatureStore(TestCase):
+    class ExampleModel(Model):
+        class Input:
+            a = Number()
+            b = Label(['x', 'y'])
+
+        class Output:
+            c = Number()
+
+    samples = [
+        (0, 'x', 1),
+        (1, 'x', 3),
+        (0, 'y', 11),
+        (1, 'y', 13),
+        (2, 'x', 5)
+    ]
+
+    def test_create(self):
+        with TemporaryDirectory() as store_path:
+            store = FeatureStore.create(
+                store_path,
+                self.ExampleModel,
+                self.ExampleModel.features_from_list(self.samples),
+                chunk_size=2
+            )
+
+            self.assertEqual(len(store), len(self.samples))
+            self.assertIsInstance(store.input_array, memmap)
+            self.assertEqual(store.input_array.shape, (5, 3))
+            self.assertEqual(store.output_array.shape, (5, 1))
+            self.assertEqual(store.input_array.tolist()[2], [0, 0, 1])
+            self.assertEqual(store.output_array.tolist()[2], [11])
+
+    def test_reopen(self):
+        with TemporaryDirectory() as store_path:
+            FeatureStore.create(store_path, self.ExampleModel, self.ExampleModel.features_from_list(self.samples))
+
+            store = FeatureStore(store_path)
+
+            self.assertEqual(store.layout, self.ExampleModel.layout())
+            self.assertEqual(len(store), len(self.samples))
+
+    def test_train_and_score(self):
+        with TemporaryDirectory() as store_path:
+            store = FeatureStore.create(store_path, self.ExampleModel, self.ExampleModel.features_from_list(self.samples))
+
+            model = self.ExampleModel.train(store)
+
+            self.assertAlmostEqual(model.score(store), 1)
+
+            for prediction, sample in zip(
+                model.predict(self.ExampleModel.input_features_from_list(sample[:2] for sample in self.samples)),
+                self.samples
+            ):
+                with self.subTest(sample=sample):
+                    self.assertAlmostEqual(prediction.c, sample[2])
+
+    def test_read_in_chunks(self):
+        with TemporaryDirectory() as store_path:
+            store = FeatureStore.create(store_path, self.ExampleModel, self.ExampleModel.features_from_list(self.samples))
+
+            with patch.object(self.ExampleModel, '_fit', autospec=True) as fit:
+                model = self.ExampleModel.train(store)
+
+            fit.assert_not_called()
+            self.assertEqual(model.normal_equations.count, len(self.samples))
+
+            with patch.object(model.model, 'score') as score:
+                self.assertAlmostEqual(model.score(store), 1)
+
+            score.assert_not_called()
+
+            class TreeModel(self.ExampleModel):
+                model_class = tree.DecisionTreeRegressor
+
+            # Models that may not be trained in chunks are given the whole store
+            with patch.object(TreeModel, '_fit', autospec=True) as fit:
+                TreeModel.train(store)
+
+            fit.assert_called_once()
+
+            del store, model
+
+    def test_sparse_features(self):
+        class TextModel(Model):
+            class Input:
+                a = Number()
+                b = Text()
+
+            class Output:
+                c = Number()
+
+        with TemporaryDirectory() as store_path:
+            with self.assertRaises(TypeError):
+                FeatureStore.create(store_path, TextModel, TextModel.features_from_list([(1, 'a b', 2)]))
+
+            self.assertFalse(path.exists(path.join(store_path, FeatureStore.input_file_name)))
+
+    def test_mismatched_schema(self):
+        with TemporaryDirectory() as store_path:
+            store = FeatureStore.create(store_path, self.ExampleModel, self.ExampleModel.features_from_list(self.samples))
+
+            with self.assertRaises(ValueError):
+                TrivialModel.train(store)
@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+from scipy.sparse import issparse
+
+from smart_fruit import Model
+from smart_fruit.feature_types import HashedLabel, Number, Text, Vector
+
+
+class TestHashedTypes(TestCase):
+    def test_hashed_label(self):
+        class ExampleModel(Model):
+            class Input:
+                a = HashedLabel(64)
+
+            class Output:
+                b = Number()
+
+        samples = [
+            ('red', 1),
+            ('green', 2),
+            ('blue', 3)
+        ]
+
+        model = ExampleModel.train(ExampleModel.features_from_list(samples))
+
+        predictions = model.predict(ExampleModel.input_features_from_list([sample[:1] for sample in samples]))
+
+        for (sample_input, sample_output), prediction in zip(samples, predictions):
+            with self.subTest(sample=sample_input):
+                self.assertAlmostEqual(prediction.b, sample_output)
+
+    def test_hashed_label_encoding(self):
+        for signed in (False, True):
+            with self.subTest(signed=signed):
+                feature_type = HashedLabel(16, seed=3, signed=signed)
+
+                features = feature_type.to_array(['a', 'b', 'a', 17])
+
+                self.assertTrue(issparse(features))
+                self.assertEqual(features.shape, (4, 16))
+                self.assertEqual(features.getnnz(axis=1).tolist(), [1, 1, 1, 1])
+                self.assertEqual(abs(features).sum(axis=1).tolist(), [[1], [1], [1], [1]])
+                self.assertEqual((features[0] != features[2]).nnz, 0)
+
+    def test_hashed_label_seed(self):
+        values = ['value {}'.format(n) for n in range(20)]
+
+        self.assertNotEqual(
+            HashedLabel(1024, seed=0).to_array(values).indices.tolist(),
+            HashedLabel(1024, seed=1).to_array(values).indices.tolist()
+        )
+
+    def test_hashed_label_in_vector(self):
+        feature_type = Vector([Number(), HashedLabel(8)])
+
+        features = feature_type.to_array([(1, 'a'), (2, 'b')])
+
+        self.assertTrue(issparse(features))
+        self.assertEqual(features.shape, (2, 9))
+        self.assertEqual(features[:, 0].toarray().tolist(), [[1], [2]])
+
+    def test_hashed_label_output(self):
+        class ExampleModel(Model):
+            class Input:
+                a = Number()
+
+            class Output:
+                b = HashedLabel(8)
+
+        model = ExampleModel.train(ExampleModel.features_from_list([
+            (0, 'a'),
+            (1, 'b')
+        ]))
+
+        with self.assertRaisesRegex(TypeError, "May not predict a HashedLabel"):
+            next(model.predict([ExampleModel.Input(0)]))
+
+    def test_text(self):
+        class ExampleModel(Model):
+            class Input:
+                a = Text(2 ** 10)
+
+            class Output:
+                b = Number()
+
+        samples = [
+            ('a good film', 1),
+            ('a bad film', -1),
+            ('a good book', 1),
+            ('a bad book', -1)
+        ]
+
+        model = ExampleModel.train(ExampleModel.features_from_list(samples))
+
+        predictions = model.predict(ExampleModel.input_features_from_list([['good'], ['bad']]))
+
+        self.assertGreater(next(predictions).b, 0)
+        self.assertLess(next(predictions).b, 0)
+
+    def test_text_encoding(self):
+        feature_type = Text(2 ** 8, ngram_range=(1, 2))
+
+        features = feature_type.to_array(['the quick fox', 'The Quick Fox', 'lazy'])
+
+        self.assertTrue(issparse(features))
+        self.assertEqual(features.shape, (3, 2 ** 8))
+        self.assertEqual((features[0] != features[1]).nnz, 0)
+        self.assertEqual(features[0].nnz, 5)
+
+    def test_text_validation(self):
+        feature_type = Text()
+
+        self.assertEqual(feature_type.validate('some text'), 'some text')
+
+        for a in (1, None, ['some', 'text']):
+            with self.subTest(a=a), \
+                 self.assertRaises(TypeError):
+                feature_type.validate(a)
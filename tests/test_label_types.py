@@ -28,6 +28,16 @@ class TestLabelTypes(TestCase):
                     label
                 )
 
+        with self.subTest("Labels to array, and back"):
+            features = ExampleModel.Input.label.to_array(list(labels))
+
+            self.assertEqual(features.tolist(), [
+                self._basis_vector(len(labels), i).tolist()
+                for i in range(len(labels))
+            ])
+
+            self.assertEqual(list(ExampleModel.Input.label.from_array(features)), list(labels))
+
     @staticmethod
     def _basis_vector(length, index):
         vector = Series([0 for _ in range(length)])
@@ -0,0 +1,146 @@
+from itertools import cycle
+from unittest import TestCase
+from unittest.mock import patch
+
+from numpy import allclose, float32
+from sklearn import tree
+
+from smart_fruit import Model
+from smart_fruit.feature_types import HashedLabel, Label, Number, Optional, Tag, Text, Vector
+
+
+class MemoryModel(Model):
+    class Input:
+        a = Number()
+        b = Label(['x', 'y', 'z'])
+        c = Vector([Number(), Optional(Number(), indicator=True)])
+        d = Tag()
+
+    class Output:
+        e = Number()
+
+
+class TestMemoryLimit(TestCase):
+    samples = [(n, 'xyz'[n % 3], (n / 2, n % 4 or None), 'tag', 2 * n + n % 3) for n in range(40)]
+
+    def setUp(self):
+        self.features = list(MemoryModel.features_from_list(self.samples))
+        self.inputs = [input_ for input_, output in self.features]
+
+    def test_estimate_memory(self):
+        # 7 encoded input columns, and 1 output column, of 8 bytes, counted twice, less the 3 byte one-hot Label block
+        self.assertEqual(MemoryModel.estimate_memory(1), 2 * 8 * 8 - 3 * 8 + 3)
+        self.assertEqual(MemoryModel.estimate_memory(1000), 1000 * (2 * 8 * 8 - 3 * 8 + 3))
+
+    def test_estimate_float32_memory(self):
+        class Float32Model(MemoryModel):
+            dtype = float32
+
+        # Blocks are encoded as before, but stacked as 4 byte floats
+        self.assertEqual(Float32Model.estimate_memory(1), 8 * 8 - 3 * 8 + 3 + 8 * 4)
+
+    def test_sparse_estimate(self):
+        class SparseModel(Model):
+            class Input:
+                a = HashedLabel(2 ** 20)
+                b = Text()
+
+            class Output:
+                c = Number()
+
+        self.assertLess(SparseModel.estimate_memory(1), 2 * 1000 * 8)
+
+        # The normal equations of so many columns would not fit, so the features are encoded at once
+        self.assertFalse(SparseModel._can_train_in_chunks(SparseModel().model))
+
+        with patch.object(SparseModel, '_fit_chunks') as fit_chunks:
+            SparseModel.train(
+                SparseModel.features_from_list([('x', 'a b', 1), ('y', 'b c', 2)]),
+                memory_limit=SparseModel.estimate_memory(2)
+            )
+
+        fit_chunks.assert_not_called()
+
+    def test_train_in_chunks(self):
+        memory_limit = MemoryModel._normal_equations_memory() + MemoryModel.estimate_memory(10)
+
+        with patch.object(MemoryModel, '_fit_chunks', autospec=True) as fit_chunks:
+            MemoryModel.train(self.features, memory_limit=memory_limit)
+
+        self.assertEqual(fit_chunks.call_args[0][2], 10)
+
+        self.assertTrue(allclose(
+            MemoryModel.train(self.features, memory_limit=memory_limit).model.coef_,
+            MemoryModel.train(self.features).model.coef_
+        ))
+
+    def test_normal_equations_memory(self):
+        # 8 input columns, with the indicator, and 1 output column, of 8 bytes, held 3 times at once
+        self.assertEqual(MemoryModel._normal_equations_memory(), 3 * 8 * 9 * 9)
+
+        with patch.object(MemoryModel, '_fit_chunks', autospec=True) as fit_chunks, \
+                self.assertRaises(MemoryError):
+            MemoryModel.train(self.features, memory_limit=MemoryModel._normal_equations_memory())
+
+        fit_chunks.assert_not_called()
+
+    def test_fail_fast(self):
+        class TreeModel(MemoryModel):
+            model_class = tree.DecisionTreeRegressor
+
+        with patch.object(TreeModel, '_arrays_from_features') as arrays_from_features, \
+                self.assertRaises(MemoryError):
+            TreeModel.train(iter(self.features), memory_limit=TreeModel.estimate_memory(39))
+
+        arrays_from_features.assert_not_called()
+
+        TreeModel.train(iter(self.features), memory_limit=TreeModel.estimate_memory(40))
+
+    def test_fail_fast_stream(self):
+        class TreeModel(MemoryModel):
+            model_class = tree.DecisionTreeClassifier
+
+        model = TreeModel.train(self.features)
+
+        # Only as many features as fit in the limit, and one more, are read from an endless stream
+        with self.assertRaises(MemoryError):
+            TreeModel.train(cycle(self.features), memory_limit=TreeModel.estimate_memory(39))
+
+        with self.assertRaises(MemoryError):
+            model.score(cycle(self.features), memory_limit=TreeModel.estimate_memory(39))
+
+    def test_predict_in_batches(self):
+        model = MemoryModel.train(self.features)
+
+        with patch.object(model, '_predict_columns', wraps=model._predict_columns) as predict_columns:
+            predictions = list(model.predict(self.inputs, memory_limit=MemoryModel.estimate_memory(15)))
+
+        self.assertEqual([len(call[0][0]) for call in predict_columns.call_args_list], [15, 15, 10])
+        self.assertTrue(allclose(predictions, list(model.predict(self.inputs))))
+
+    def test_score(self):
+        model = MemoryModel.train(self.features)
+
+        with patch.object(model, '_chunk_metrics', wraps=model._chunk_metrics) as chunk_metrics:
+            score = model.score(self.features, memory_limit=MemoryModel.estimate_memory(15))
+
+        self.assertEqual([len(call[0][0]) for call in chunk_metrics.call_args_list], [15, 15, 10])
+        self.assertAlmostEqual(score, model.score(self.features))
+
+    def test_score_fail_fast(self):
+        class TreeModel(MemoryModel):
+            model_class = tree.DecisionTreeClassifier
+
+        model = TreeModel.train(self.features)
+
+        with self.assertRaises(MemoryError):
+            model.score(self.features, memory_limit=TreeModel.estimate_memory(39))
+
+        self.assertEqual(
+            model.score(self.features, memory_limit=TreeModel.estimate_memory(40)),
+            model.score(self.features)
+        )
+
+    def test_row_too_large(self):
+        with self.assertRaises(MemoryError):
+            list(MemoryModel.train(self.features).predict(self.inputs, memory_limit=10))
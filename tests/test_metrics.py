@@ -0,0 +1,149 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from numpy import array, zeros
+from numpy.random import RandomState
+from sklearn import neighbors
+from sklearn.metrics import accuracy_score, mean_absolute_error, r2_score
+
+from smart_fruit import FeatureStore, Model
+from smart_fruit.feature_types import Label, Number, Vector
+from smart_fruit.metrics import Accuracy, MeanAbsoluteError, R2Score
+
+
+class MetricsModel(Model):
+    class Input:
+        a = Number()
+        b = Number()
+
+    class Output:
+        c = Number()
+        d = Vector([Number(), Number()])
+        e = Label(['x', 'y'])
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        random_state = RandomState(0)
+
+        self.y_true = random_state.normal(size=(50, 3))
+        self.y_pred = self.y_true + random_state.normal(scale=0.5, size=(50, 3))
+
+    def _accumulate(self, metric, y_true, y_pred, chunk_size):
+        for start in range(0, len(y_true), chunk_size):
+            metric.update(y_true[start:start + chunk_size], y_pred[start:start + chunk_size])
+
+        return metric
+
+    def test_r2_score(self):
+        for chunk_size in (1, 7, 50):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertAlmostEqual(
+                    self._accumulate(R2Score(3), self.y_true, self.y_pred, chunk_size).result(),
+                    r2_score(self.y_true, self.y_pred)
+                )
+
+    def test_constant_columns(self):
+        y_true = array([[1, 2], [1, 3]])
+
+        self.assertEqual(R2Score(2).result(), 1)
+
+        for y_pred in ([[1, 2], [1, 3]], [[1, 2], [1, 2]], [[2, 2], [1, 3]]):
+            with self.subTest(y_pred=y_pred):
+                score = R2Score(2)
+                score.update(y_true, y_pred)
+
+                self.assertAlmostEqual(score.result(), r2_score(y_true, y_pred))
+
+    def test_mean_absolute_error(self):
+        self.assertAlmostEqual(
+            self._accumulate(MeanAbsoluteError(3), self.y_true, self.y_pred, 7).result(),
+            mean_absolute_error(self.y_true, self.y_pred)
+        )
+
+    def test_accuracy(self):
+        labels_true = self.y_true.argmax(axis=1)
+        labels_pred = self.y_pred.argmax(axis=1)
+
+        self.assertAlmostEqual(
+            self._accumulate(Accuracy(), labels_true, labels_pred, 7).result(),
+            accuracy_score(labels_true, labels_pred)
+        )
+
+    def test_merge(self):
+        for metric_class, args in ((R2Score, (3,)), (MeanAbsoluteError, (3,)), (Accuracy, ())):
+            with self.subTest(metric_class=metric_class.__name__):
+                whole = self._accumulate(metric_class(*args), self.y_true, self.y_pred, 50)
+
+                first = self._accumulate(metric_class(*args), self.y_true[:20], self.y_pred[:20], 7)
+                second = self._accumulate(metric_class(*args), self.y_true[20:], self.y_pred[20:], 7)
+                first.merge(second)
+                first.merge(metric_class(*args))
+
+                self.assertAlmostEqual(first.result(), whole.result())
+
+
+class TestStreamingScore(TestCase):
+    samples = [(a, b, a - b, (a + b, 2 * a), 'x' if a > b else 'y') for a in range(-5, 6) for b in range(4)]
+
+    def setUp(self):
+        self.features = list(MetricsModel.features_from_list(self.samples))
+        self.model = MetricsModel.train(self.features)
+
+    def test_score(self):
+        expected_score = self.model.score(self.features)
+
+        for chunk_size in (1, 10, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertAlmostEqual(self.model.score(iter(self.features), chunk_size=chunk_size), expected_score)
+
+        self.assertAlmostEqual(self.model.score(self.features, chunk_size=10, workers=2), expected_score)
+
+    def test_feature_store(self):
+        with TemporaryDirectory() as store_path:
+            store = FeatureStore.create(store_path, MetricsModel, self.features, model=self.model)
+
+            self.assertAlmostEqual(self.model.score(store, chunk_size=10), self.model.score(self.features))
+
+            del store
+
+    def test_classifier(self):
+        class ClassifierModel(MetricsModel):
+            model_class = neighbors.KNeighborsClassifier
+
+        model = ClassifierModel.train(self.features)
+
+        with self.assertRaises(TypeError):
+            model.score(self.features, chunk_size=10)
+
+        self.assertEqual(set(model.evaluate(self.features)), {'c', 'd', 'e'})
+
+    def test_evaluate(self):
+        metrics = self.model.evaluate(iter(self.features), chunk_size=10)
+
+        self.assertEqual(set(metrics), {'c', 'd', 'e'})
+        self.assertEqual(set(metrics['c']), {'r2', 'mae'})
+        self.assertEqual(set(metrics['e']), {'accuracy'})
+
+        # c, and d, are linear in the inputs, so predicted exactly
+        self.assertAlmostEqual(metrics['c']['r2'], 1)
+        self.assertAlmostEqual(metrics['d']['mae'], 0)
+
+        predicted_labels = [output.e for output in self.model.predict(input_ for input_, output in self.features)]
+        self.assertAlmostEqual(
+            metrics['e']['accuracy'],
+            accuracy_score([output.e for input_, output in self.features], predicted_labels)
+        )
+
+        self.assertEqual(self.model.evaluate(self.features, chunk_size=7, workers=2), metrics)
+
+    def test_tied_labels(self):
+        # Every label is tied, so predicted as the later label, 'y'
+        with patch.object(self.model.model, 'predict', return_value=zeros((len(self.features), 5))):
+            self.assertEqual({output.e for output in self.model.predict(input_ for input_, output in self.features)}, {'y'})
+
+            self.assertAlmostEqual(
+                self.model.evaluate(self.features)['e']['accuracy'],
+                sum(output.e == 'y' for input_, output in self.features) / len(self.features)
+            )
@@ -0,0 +1,177 @@
+from unittest import TestCase
+
+from numpy import allclose, column_stack, ones
+from numpy.random import RandomState
+from scipy.sparse import csr_matrix
+from sklearn import linear_model, tree
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Number, Label, Text
+from smart_fruit.least_squares import NormalEquations
+
+
+class ExampleModel(Model):
+    updatable = True
+
+    class Input:
+        a = Number(scale='standard')
+        b = Label(['x', 'y', 'z'])
+
+    class Output:
+        c = Number()
+        d = Number()
+
+
+def _samples(random_state, count):
+    for a, b in zip(random_state.normal(size=count), random_state.randint(3, size=count)):
+        yield a, 'xyz'[b], 2 * a + b, a - 3 * b + 1
+
+
+class RecordingRegressor(linear_model.LinearRegression):
+    def __init__(self):
+        super().__init__()
+        self.partial_fit_sizes = []
+
+    def partial_fit(self, x, y):
+        self.partial_fit_sizes.append(len(x))
+
+
+class TestNormalEquations(TestCase):
+    def setUp(self):
+        random_state = RandomState(0)
+
+        self.x = column_stack([random_state.normal(size=(50, 3)), ones(50), ones(50)])
+        self.x[:, 4] = self.x[:, 0] + self.x[:, 1]
+        self.y = random_state.normal(size=(50, 2))
+
+    def _check_solution(self, x, fit_intercept):
+        expected = linear_model.LinearRegression(fit_intercept=fit_intercept).fit(self.x, self.y)
+
+        equations = NormalEquations(x.shape[1], self.y.shape[1])
+        equations.update(x[:20], self.y[:20])
+
+        other_equations = NormalEquations(x.shape[1], self.y.shape[1])
+        other_equations.update(x[20:35], self.y[20:35])
+        other_equations.update(x[35:], self.y[35:])
+
+        equations.merge(other_equations)
+
+        model = equations.solve(linear_model.LinearRegression(fit_intercept=fit_intercept))
+
+        self.assertTrue(allclose(model.coef_, expected.coef_))
+        self.assertTrue(allclose(model.intercept_, expected.intercept_))
+        self.assertTrue(allclose(model.predict(self.x), expected.predict(self.x)))
+
+    def test_solution(self):
+        for fit_intercept in (True, False):
+            with self.subTest(fit_intercept=fit_intercept):
+                self._check_solution(self.x, fit_intercept)
+
+    def test_sparse_solution(self):
+        for fit_intercept in (True, False):
+            with self.subTest(fit_intercept=fit_intercept):
+                self._check_solution(csr_matrix(self.x), fit_intercept)
+
+    def test_can_solve(self):
+        self.assertTrue(NormalEquations.can_solve(linear_model.LinearRegression()))
+        self.assertFalse(NormalEquations.can_solve(linear_model.LinearRegression(positive=True)))
+        self.assertFalse(NormalEquations.can_solve(linear_model.Ridge()))
+
+
+class TestModelUpdate(TestCase):
+    def setUp(self):
+        random_state = RandomState(0)
+
+        self.samples = list(_samples(random_state, 100))
+        self.new_samples = list(_samples(random_state, 10))
+
+    def test_linear_regression_update(self):
+        model = ExampleModel.train(ExampleModel.features_from_list(self.samples))
+        statistics_json = model.input_statistics[0].to_json()
+
+        model.update(ExampleModel.features_from_list(self.new_samples))
+
+        self.assertEqual(model.input_statistics[0].to_json(), statistics_json)
+
+        # Retrain with the same statistics, to compare the solutions
+        expected_model = ExampleModel()
+        expected_model.input_statistics = model.input_statistics
+        expected_model.model.fit(*expected_model._raw_features(
+            ExampleModel.features_from_list(self.samples + self.new_samples)
+        ))
+
+        self.assertTrue(allclose(model.model.coef_, expected_model.model.coef_))
+        self.assertTrue(allclose(model.model.intercept_, expected_model.model.intercept_))
+
+    def test_not_updatable_by_default(self):
+        class DefaultModel(ExampleModel):
+            updatable = False
+
+        features = list(DefaultModel.features_from_list(self.samples))
+        model = DefaultModel.train(features)
+
+        # Fit by the LinearRegression itself, unless chunked
+        self.assertIsNone(model.normal_equations)
+        self.assertEqual(model.model.rank_, 3)
+
+        with self.assertRaises(TypeError):
+            model.update(DefaultModel.features_from_list(self.new_samples))
+
+        chunked_model = DefaultModel.train(features, chunk_size=30)
+        chunked_model.update(DefaultModel.features_from_list(self.new_samples))
+
+        self.assertEqual(chunked_model.normal_equations.count, 110)
+
+    def test_partial_fit_update(self):
+        class PartialFitModel(ExampleModel):
+            model_class = RecordingRegressor
+
+        model = PartialFitModel.train(PartialFitModel.features_from_list(self.samples))
+        model.update(PartialFitModel.features_from_list(self.new_samples))
+
+        self.assertEqual(model.model.partial_fit_sizes, [10])
+
+    def test_warm_start_not_updatable(self):
+        class WarmStartModel(ExampleModel):
+            model_class = linear_model.ElasticNet
+
+        model = WarmStartModel.train(WarmStartModel.features_from_list(self.samples))
+        coefficients = model.model.coef_.copy()
+
+        # Refitting with warm_start would give the model of the new features alone
+        with self.assertRaises(TypeError):
+            model.update(WarmStartModel.features_from_list(self.new_samples))
+
+        self.assertFalse(model.model.warm_start)
+        self.assertTrue(allclose(model.model.coef_, coefficients))
+
+    def test_wide_sparse_inputs(self):
+        class TextModel(Model):
+            class Input:
+                a = Text()
+
+            class Output:
+                b = Number()
+
+        features = list(TextModel.features_from_list([('a b', 1), ('b c', 2)]))
+
+        # The default Text has too many columns to hold the normal equations of
+        model = TextModel.train(features)
+
+        self.assertIsNone(model.normal_equations)
+        self.assertEqual(model.model.coef_.shape[-1], 2 ** 20)
+
+        with self.assertRaises(TypeError):
+            model.update(features)
+
+        with self.assertRaises(TypeError):
+            TextModel.train(features, chunk_size=1)
+
+    def test_not_updatable(self):
+        class TreeModel(ExampleModel):
+            model_class = tree.DecisionTreeRegressor
+
+        model = TreeModel.train(TreeModel.features_from_list(self.samples))
+
+        with self.assertRaises(TypeError):
+            model.update(TreeModel.features_from_list(self.new_samples))
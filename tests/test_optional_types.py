@@ -0,0 +1,180 @@
+from io import StringIO
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import array, isnan, nan
+from numpy.random import RandomState
+from scipy.sparse import issparse
+
+from smart_fruit import Model
+from smart_fruit.feature_types import HashedLabel, Label, Number, Optional, Text, Vector
+from smart_fruit.statistics import QuantileSketch
+
+
+class ShortRowsModel(Model):
+    class Input:
+        a = Number()
+        b = Optional(Number())
+
+    class Output:
+        c = Number()
+
+
+class TestOptionalTypes(TestCase):
+    def test_optional_validation(self):
+        feature_type = Optional(Number())
+
+        for a, b in ((1, 1), ('2', 2), (None, None), ('', None), (float('nan'), None)):
+            with self.subTest(a=a):
+                self.assertEqual(feature_type.validate(a), b)
+
+        for a in ('a', float('inf')):
+            with self.subTest(a=a), \
+                 self.assertRaises((TypeError, ValueError)):
+                feature_type.validate(a)
+
+        with self.assertRaises(ValueError):
+            Optional(Number(), impute='unknown')
+
+        with self.assertRaises(TypeError):
+            Optional(Number(), impute='constant', fill_value=None)
+
+    def test_optional_encoding(self):
+        values = [1, None, 3]
+
+        with self.subTest(impute='mean'):
+            features = Optional(Number(), indicator=True).to_array(values)
+
+            self.assertEqual(features[:, 1].tolist(), [0, 1, 0])
+            self.assertTrue(isnan(features[1, 0]))
+
+        with self.subTest(impute='constant'):
+            features = Optional(Label(['a', 'b']), impute='constant', fill_value='b').to_array(['a', None])
+
+            self.assertEqual(features.tolist(), [[1, 0], [0, 1]])
+
+    def test_optional_decoding(self):
+        feature_type = Optional(Number(), indicator=True)
+
+        self.assertEqual(list(feature_type.from_array(array([[1, 0], [2, 0.9]]))), [1, None])
+
+    def _train(self, feature_type, samples):
+        class ExampleModel(Model):
+            class Input:
+                a = feature_type
+
+            class Output:
+                b = Number()
+
+        return ExampleModel, ExampleModel.train(ExampleModel.features_from_list(samples))
+
+    def test_mean_imputation(self):
+        ExampleModel, model = self._train(Optional(Number()), [(1, 2), (3, 6), (None, 8), (8, 16)])
+
+        raw_features = model._to_raw_features([ExampleModel.Input(None)], ExampleModel.Input, model.input_statistics)
+
+        self.assertAlmostEqual(raw_features[0, 0], 4)
+
+        self.assertAlmostEqual(next(model.predict([ExampleModel.Input(None)])).b, 8)
+        self.assertAlmostEqual(next(model.predict([ExampleModel.Input(2)])).b, 4)
+
+    def test_median_imputation(self):
+        ExampleModel, model = self._train(
+            Optional(Number(scale='standard'), impute='median', indicator=True),
+            [(1, 2), (3, 6), (None, 4), (100, 16), (None, 4)]
+        )
+
+        raw_features = model._to_raw_features([ExampleModel.Input(None)], ExampleModel.Input, model.input_statistics)
+        statistics = model.input_statistics[0]
+
+        self.assertAlmostEqual(
+            raw_features[0, 0],
+            (3 - statistics.moments.mean[0]) / statistics.moments.standard_deviation[0]
+        )
+        self.assertEqual(raw_features[0, 1], 1)
+
+    def test_quantile_sketch(self):
+        values = RandomState(0).normal(size=100000)
+
+        sketch = QuantileSketch()
+        other_sketch = QuantileSketch()
+
+        for start in range(0, len(values), 10000):
+            sketch.update(values[start:start + 5000])
+            other_sketch.update(values[start + 5000:start + 10000])
+
+        sketch.merge(other_sketch)
+        sketch.update([nan])
+
+        self.assertLess(sum(len(level) for level in sketch.levels), 2000)
+        self.assertAlmostEqual(sketch.quantile(0.5), 0, delta=0.05)
+        self.assertAlmostEqual(sketch.quantile(0.9), 1.2816, delta=0.05)
+
+    def test_missing_features_from_csv_and_json(self):
+        class ExampleModel(Model):
+            class Input:
+                a = Number()
+                b = Optional(Number())
+
+            class Output:
+                c = Number()
+
+        self.assertEqual(
+            list(ExampleModel.input_features_from_csv(StringIO("a,b\n1,2\n3,\n4"))),
+            [ExampleModel.Input(1, 2), ExampleModel.Input(3, None), ExampleModel.Input(4, None)]
+        )
+
+        self.assertEqual(
+            list(ExampleModel.input_features_from_json([{'a': 1}])),
+            [ExampleModel.Input(1, None)]
+        )
+
+        with self.assertRaises(TypeError):
+            list(ExampleModel.input_features_from_json([{'b': 1}]))
+
+    def test_sparse_imputation(self):
+        for feature_type in (Text(), HashedLabel(10 ** 6), Vector([Number(), Text()])):
+            for impute in ('mean', 'median'):
+                with self.subTest(feature_type=feature_type.__class__.__name__, impute=impute):
+                    with self.assertRaises(ValueError):
+                        Optional(feature_type, impute=impute)
+
+        optional_label = Optional(HashedLabel(10 ** 6), impute='constant', fill_value='missing', indicator=True)
+        features = optional_label.to_array(['a', None, 'missing'])
+
+        self.assertTrue(issparse(features))
+        self.assertEqual(features.shape, (3, 10 ** 6 + 1))
+        self.assertEqual(features[:, -1].toarray().ravel().tolist(), [0, 1, 0])
+        self.assertEqual(features[1, :-1].nnz, 1)
+        self.assertEqual((features[1, :-1] != features[2, :-1]).nnz, 0)
+
+    def test_short_csv_rows(self):
+        with TemporaryDirectory() as csv_directory:
+            csv_path = path.join(csv_directory, 'short_rows.csv')
+
+            with open(csv_path, 'w', encoding='utf-8') as csv_file:
+                csv_file.write("a,c,b\n1,2,3\n4,5\n6\n")
+
+            for csv_source in (lambda: StringIO("a,c,b\n1,2,3\n4,5\n6\n"), lambda: csv_path):
+                with self.subTest(csv_source=csv_source()):
+                    # Only the Optional column may be left out
+                    self.assertEqual(
+                        list(ShortRowsModel.input_features_from_csv(csv_source())),
+                        [ShortRowsModel.Input(1, 3), ShortRowsModel.Input(4, None), ShortRowsModel.Input(6, None)]
+                    )
+
+                    with self.assertRaises(IndexError):
+                        list(ShortRowsModel.features_from_csv(csv_source()))
+
+            with self.assertRaises(IndexError):
+                list(ShortRowsModel.features_from_csv(csv_path, workers=2))
+
+    def test_optional_output(self):
+        with self.assertRaises(TypeError):
+            class ExampleModel(Model):
+                class Input:
+                    a = Number()
+
+                class Output:
+                    b = Optional(Number())
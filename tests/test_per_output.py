@@ -0,0 +1,113 @@
+from unittest import TestCase
+
+from sklearn import linear_model, svm, tree
+from sklearn.multioutput import MultiOutputRegressor
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Complex, Number, Label, Vector
+
+
+class PerOutputModel(Model):
+    fit_per_output = True
+    model_class = tree.DecisionTreeRegressor
+    classifier_class = tree.DecisionTreeClassifier
+
+    class Input:
+        a = Number()
+        b = Number()
+
+    class Output:
+        c = Number()
+        d = Label(['x', 'y', 'z'])
+        e = Vector([Number(), Number()])
+
+
+class TestPerOutputModel(TestCase):
+    samples = [
+        (a, b, a + b, 'xyz'[(a + b) % 3], (a, b))
+        for a in range(4)
+        for b in range(4)
+    ]
+
+    def setUp(self):
+        self.features = list(PerOutputModel.features_from_list(self.samples))
+        self.inputs = [input_ for input_, output in self.features]
+
+    def test_fits_estimator_per_output(self):
+        model = PerOutputModel.train(self.features)
+
+        self.assertEqual(
+            [estimator.__class__ for estimator in model.model.estimators],
+            [tree.DecisionTreeRegressor, tree.DecisionTreeClassifier, MultiOutputRegressor]
+        )
+
+    def test_predict(self):
+        model = PerOutputModel.train(self.features)
+
+        self.assertEqual(
+            [(output.c, output.d, output.e) for output in model.predict(self.inputs)],
+            [(output.c, output.d, output.e) for input_, output in self.features]
+        )
+        self.assertEqual(model.score(self.features), 1)
+
+    def test_single_output_regressor(self):
+        class SVRModel(PerOutputModel):
+            model_class = svm.SVR
+
+            class Output:
+                c = Number()
+                e = Vector([Number(), Number()])
+                f = Complex()
+
+        model = SVRModel.train(SVRModel.features_from_list(
+            (a, b, a + b, (a, b), complex(a, b))
+            for a in range(4)
+            for b in range(4)
+        ))
+
+        self.assertEqual(
+            [estimator.__class__ for estimator in model.model.estimators],
+            [svm.SVR, MultiOutputRegressor, MultiOutputRegressor]
+        )
+        self.assertEqual(len(model.model.estimators[1].estimators_), 2)
+
+        prediction, = model.predict(SVRModel.input_features_from_list([(1, 2)]))
+
+        self.assertEqual(len(prediction.e), 2)
+        self.assertIsInstance(prediction.f, complex)
+
+    def test_parallel(self):
+        class ParallelModel(PerOutputModel):
+            n_jobs = 2
+
+        model = ParallelModel.train(ParallelModel.features_from_list(self.samples))
+
+        self.assertEqual(
+            list(model.predict(self.inputs)),
+            list(PerOutputModel.train(self.features).predict(self.inputs))
+        )
+
+    def test_single_label(self):
+        class SingleLabelModel(Model):
+            fit_per_output = True
+            classifier_class = linear_model.LogisticRegression
+
+            class Input:
+                a = Number()
+
+            class Output:
+                b = Label(['x', 'y'])
+
+        model = SingleLabelModel.train(SingleLabelModel.features_from_list([(0, 'y'), (1, 'y')]))
+
+        self.assertEqual(list(model.predict(SingleLabelModel.input_features_from_list([[2]]))), [('y',)])
+
+    def test_model_arguments(self):
+        class DepthModel(PerOutputModel):
+            def __init__(self):
+                super().__init__(max_depth=1)
+
+        model = DepthModel.train(DepthModel.features_from_list(self.samples))
+
+        self.assertEqual(model.model.estimators[0].max_depth, 1)
+        self.assertIsNone(model.model.estimators[1].max_depth)
@@ -0,0 +1,115 @@
+from pickle import dumps, loads
+from unittest import TestCase
+from unittest.mock import patch
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Array, Number, Tag
+from smart_fruit.prediction_cache import PredictionCache
+
+
+class CachedModel(Model):
+    updatable = True
+
+    class Input:
+        a = Number()
+        b = Tag()
+
+    class Output:
+        c = Number()
+
+
+class ArrayModel(Model):
+    class Input:
+        a = Array(2)
+
+    class Output:
+        b = Number()
+
+
+class TestPredictionCache(TestCase):
+    def setUp(self):
+        self.model = CachedModel.train(CachedModel.features_from_list([(0, 'x', 1), (1, 'y', 3)]))
+        self.model.cache_predictions()
+
+    def _predict(self, values):
+        return [output.c for output in self.model.predict(CachedModel.input_features_from_list(values))]
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self._predict([(2, 'x'), (3, 'x')]), [5, 7])
+        self.assertEqual((self.model.prediction_cache.hits, self.model.prediction_cache.misses), (0, 2))
+
+        # Tags are not compared
+        with patch.object(self.model, '_predict_columns', wraps=self.model._predict_columns) as predict_columns:
+            self.assertEqual(self._predict([(2, 'y'), (4, 'x'), (3, 'z')]), [5, 9, 7])
+
+        self.assertEqual(predict_columns.call_count, 1)
+        self.assertEqual(len(predict_columns.call_args[0][0]), 1)
+        self.assertEqual((self.model.prediction_cache.hits, self.model.prediction_cache.misses), (2, 3))
+
+    def test_predict_one(self):
+        self.assertEqual(self.model.predict_one(CachedModel.Input(2, 'x')), (5,))
+        self.assertEqual(self.model.predict_one(CachedModel.Input(2, 'x')), (5,))
+        self.assertEqual(self.model.prediction_cache.hits, 1)
+
+    def test_invalidated_on_update(self):
+        self._predict([(2, 'x')])
+
+        self.model.update(CachedModel.features_from_list([(2, 'x', 7)]))
+
+        self.assertEqual(len(self.model.prediction_cache), 0)
+        self.assertNotAlmostEqual(self._predict([(2, 'x')])[0], 5)
+
+    def test_invalidated_on_reload(self):
+        self._predict([(2, 'x')])
+
+        model = loads(dumps(self.model))
+
+        self.assertEqual(len(model.prediction_cache), 0)
+        self.assertEqual(model.prediction_cache.max_size, 1024)
+
+    def test_unhashable_inputs(self):
+        model = ArrayModel.train(ArrayModel.features_from_list([([0, 1], 1), ([1, 0], 2), ([1, 1], 3)]))
+        model.cache_predictions()
+
+        list(model.predict(ArrayModel.input_features_from_list([([0, 1],)])))
+
+        self.assertEqual(len(model.prediction_cache), 0)
+
+    def test_max_size(self):
+        cache = PredictionCache(max_size=2)
+
+        for key in 'abc':
+            cache.put(key, key.upper())
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 'B')
+
+        cache.put('d', 'D')
+
+        # 'b' was used more recently than 'c'
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(cache.get('b'), 'B')
+
+    def test_max_bytes(self):
+        cache = PredictionCache(max_bytes=1000)
+
+        for key in range(100):
+            cache.put(key, (key,))
+
+        self.assertLessEqual(cache.byte_count, 1000)
+        self.assertEqual(cache.get(99), (99,))
+        self.assertIsNone(cache.get(0))
+
+    def test_ttl(self):
+        cache = PredictionCache(ttl=10)
+
+        with patch('smart_fruit.prediction_cache.monotonic', return_value=0):
+            cache.put('a', 'A')
+
+        with patch('smart_fruit.prediction_cache.monotonic', return_value=5):
+            self.assertEqual(cache.get('a'), 'A')
+
+        with patch('smart_fruit.prediction_cache.monotonic', return_value=10):
+            self.assertIsNone(cache.get('a'))
+
+        self.assertEqual(len(cache), 0)
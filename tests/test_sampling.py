@@ -0,0 +1,147 @@
+from collections import Counter
+from unittest import TestCase
+
+from numpy.random import RandomState
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Label, Number
+from smart_fruit.model_selection import Reservoir, reservoir_sample
+
+
+class SampledModel(Model):
+    updatable = True
+
+    class Input:
+        a = Number()
+
+    class Output:
+        b = Label(['rare', 'common'])
+        c = Number()
+
+
+class TestSampling(TestCase):
+    def test_short_stream(self):
+        self.assertEqual(reservoir_sample(range(5), 10), list(range(5)))
+
+    def test_uniform(self):
+        random_state = RandomState(0)
+        counts = Counter()
+
+        for _ in range(2000):
+            sample = reservoir_sample(range(100), 10, random_state=random_state)
+
+            self.assertEqual(len(sample), 10)
+            self.assertEqual(len(set(sample)), 10)
+
+            counts.update(sample)
+
+        # Each item is sampled with probability 0.1, so about 200 times
+        self.assertGreater(min(counts[i] for i in range(100)), 140)
+        self.assertLess(max(counts[i] for i in range(100)), 260)
+
+    def test_random_state(self):
+        self.assertEqual(
+            reservoir_sample(range(1000), 10, random_state=0),
+            reservoir_sample(range(1000), 10, random_state=0)
+        )
+
+    def test_stratified(self):
+        sample = reservoir_sample(
+            range(1000),
+            11,
+            stratify=lambda n: n % 10 == 0,
+            strata=[True, False],
+            random_state=0
+        )
+
+        self.assertEqual(Counter(n % 10 == 0 for n in sample), {True: 1, False: 10})
+
+        balanced_sample = reservoir_sample(
+            range(1000),
+            11,
+            stratify=lambda n: n % 10 == 0,
+            strata=[True, False],
+            balance=True,
+            random_state=0
+        )
+
+        self.assertEqual(Counter(n % 10 == 0 for n in balanced_sample), {True: 6, False: 5})
+
+        with self.assertRaises(ValueError):
+            reservoir_sample(range(10), 5, stratify=lambda n: n % 2, balance=True)
+
+    def test_stratified_uniform(self):
+        random_state = RandomState(0)
+        counts = Counter()
+
+        for _ in range(500):
+            sample = reservoir_sample(range(1000), 20, stratify=lambda n: n % 4 == 0, random_state=random_state)
+
+            # Strata are first seen in the order True, False
+            self.assertEqual([n % 4 == 0 for n in sample], [True] * 5 + [False] * 15)
+
+            counts.update(n // 100 for n in sample)
+
+        # Each tenth of the stream is sampled about 1000 times, in proportion to its features
+        self.assertGreater(min(counts.values()), 850)
+        self.assertLess(max(counts.values()), 1150)
+
+    def test_resize(self):
+        reservoir = Reservoir(10, random_state=0)
+
+        for n in range(100):
+            reservoir.add(n)
+
+        reservoir.resize(4)
+
+        self.assertEqual(len(reservoir.items), 4)
+        self.assertTrue(set(reservoir.items) <= set(range(100)))
+
+        reservoir.resize(6)
+
+        for n in range(100, 102):
+            reservoir.add(n)
+
+        self.assertEqual(len(reservoir.items), 6)
+        self.assertEqual(reservoir.items[-2:], [100, 101])
+        self.assertEqual(reservoir.count, 102)
+
+    def test_empty_reservoir(self):
+        reservoir = Reservoir(0)
+
+        for n in range(10):
+            reservoir.add(n)
+
+        self.assertEqual(reservoir.items, [])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            reservoir_sample(range(10), 0)
+
+    def test_train(self):
+        samples = [(n, 'rare' if n % 10 == 0 else 'common', n) for n in range(1000)]
+
+        with self.subTest(stratify_by=None):
+            model = SampledModel.train(SampledModel.features_from_list(samples), max_samples=20, random_state=0)
+
+            self.assertEqual(model.normal_equations.count, 20)
+
+        with self.subTest(stratify_by='b'):
+            features = SampledModel._sample_features(
+                SampledModel.features_from_list(samples),
+                max_samples=20,
+                stratify_by='b',
+                random_state=0
+            )
+
+            self.assertEqual(Counter(output.b for input_, output in features), {'rare': 2, 'common': 18})
+
+            SampledModel.train(SampledModel.features_from_list(samples), max_samples=20, stratify_by='b')
+
+        for stratify_by in ('a', 'c', 'd'):
+            with self.subTest(stratify_by=stratify_by), \
+                 self.assertRaises(ValueError):
+                SampledModel.train(SampledModel.features_from_list(samples), max_samples=20, stratify_by=stratify_by)
+
+        with self.assertRaises(ValueError):
+            SampledModel.train(SampledModel.features_from_list(samples), stratify_by='b')
@@ -0,0 +1,148 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import allclose
+from numpy.random import RandomState
+
+from smart_fruit import FeatureStore, Model
+from smart_fruit.feature_types import Number, Text, Vector
+from smart_fruit.statistics import RunningMoments
+
+
+class TestScaling(TestCase):
+    class ExampleModel(Model):
+        class Input:
+            a = Number(scale='standard')
+            b = Vector([Number(), Number(scale='minmax')])
+
+        class Output:
+            c = Number()
+
+    samples = [
+        (a, (b, c), 3 * a - 2 * b + c + 1)
+        for a, b, c in [(0, 10, 100), (1, 20, 300), (2, 10, 200), (5, 40, 100), (3, 30, 400)]
+    ]
+
+    def test_moments(self):
+        block = RandomState(0).normal(5, 3, size=(100, 3))
+
+        moments = RunningMoments(3)
+        moments.update(block[:30])
+
+        other_moments = RunningMoments(3)
+        other_moments.update(block[30:70])
+        other_moments.update(block[70:])
+
+        moments.merge(other_moments)
+
+        self.assertTrue(allclose(moments.count, 100))
+        self.assertTrue(allclose(moments.mean, block.mean(axis=0)))
+        self.assertTrue(allclose(moments.variance, block.var(axis=0)))
+        self.assertTrue(allclose(moments.minimum, block.min(axis=0)))
+        self.assertTrue(allclose(moments.maximum, block.max(axis=0)))
+
+    def test_scaled_training(self):
+        model = self.ExampleModel.train(self.ExampleModel.features_from_list(self.samples))
+
+        self.assertAlmostEqual(model.input_statistics[0].moments.mean[0], 2.2)
+        self.assertAlmostEqual(model.input_statistics[1].moments.minimum[1], 100)
+
+        raw_features = model._to_raw_features(
+            list(self.ExampleModel.input_features_from_list(sample[:2] for sample in self.samples)),
+            self.ExampleModel.Input,
+            model.input_statistics
+        )
+
+        self.assertAlmostEqual(raw_features[:, 0].mean(), 0)
+        self.assertAlmostEqual(raw_features[:, 0].std(), 1)
+        self.assertEqual(raw_features[:, 1].tolist(), [10, 20, 10, 40, 30])
+        self.assertEqual(raw_features[:, 2].tolist(), [0, 2 / 3, 1 / 3, 0, 1])
+
+        predictions = model.predict(self.ExampleModel.input_features_from_list(sample[:2] for sample in self.samples))
+
+        for sample, prediction in zip(self.samples, predictions):
+            with self.subTest(sample=sample):
+                self.assertAlmostEqual(prediction.c, sample[2])
+
+    def test_scaled_sparse_features(self):
+        class ExampleModel(Model):
+            class Input:
+                a = Text(2 ** 8)
+                b = Number(scale='standard')
+
+            class Output:
+                c = Number()
+
+        samples = [
+            ('good', 1, 11),
+            ('bad', 1, -9),
+            ('good', 2, 12),
+            ('bad', 3, -7)
+        ]
+
+        model = ExampleModel.train(ExampleModel.features_from_list(samples))
+
+        predictions = model.predict(ExampleModel.input_features_from_list(sample[:2] for sample in samples))
+
+        for sample, prediction in zip(samples, predictions):
+            with self.subTest(sample=sample):
+                self.assertAlmostEqual(prediction.c, sample[2])
+
+    def test_scaled_feature_store(self):
+        with TemporaryDirectory() as store_path, TemporaryDirectory() as test_store_path:
+            store = FeatureStore.create(
+                store_path,
+                self.ExampleModel,
+                self.ExampleModel.features_from_list(self.samples),
+                chunk_size=2
+            )
+
+            self.assertAlmostEqual(store.input_array[:, 0].mean(), 0)
+            self.assertEqual(store.input_array[:, 2].tolist(), [0, 2 / 3, 1 / 3, 0, 1])
+
+            model = self.ExampleModel.train(store)
+
+            self.assertAlmostEqual(model.score(store), 1)
+
+            predictions = model.predict(
+                self.ExampleModel.input_features_from_list(sample[:2] for sample in self.samples)
+            )
+
+            for sample, prediction in zip(self.samples, predictions):
+                with self.subTest(sample=sample):
+                    self.assertAlmostEqual(prediction.c, sample[2])
+
+            test_samples = [
+                (a, (b, c), 3 * a - 2 * b + c + 1)
+                for a, b, c in [(4, 10, 200), (-1, 50, 0)]
+            ]
+
+            test_store = FeatureStore.create(
+                test_store_path,
+                self.ExampleModel,
+                self.ExampleModel.features_from_list(test_samples),
+                model=model
+            )
+
+            self.assertAlmostEqual(model.score(test_store), 1)
+
+            unscaled_store = FeatureStore.create(
+                test_store_path,
+                self.ExampleModel,
+                self.ExampleModel.features_from_list(test_samples)
+            )
+
+            with self.assertRaises(ValueError):
+                model.score(unscaled_store)
+
+    def test_scale_errors(self):
+        with self.assertRaises(ValueError):
+            Number(scale='unknown')
+
+        with self.assertRaises(TypeError):
+            class ExampleModel(Model):
+                class Input:
+                    a = Number()
+
+                class Output:
+                    b = Number(scale='standard')
@@ -0,0 +1,119 @@
+import gzip
+from os import mkfifo, path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Number, Label
+
+
+class ShardModel(Model):
+    # Defined at module level, so it may be sent to worker processes
+    class Input:
+        a = Number()
+        b = Label(['x', 'y'])
+
+    class Output:
+        c = Number()
+
+
+class TestShardedCSV(TestCase):
+    shard_contents = [
+        "a,b,c\n" + "".join("{},x,{}\n".format(n, 2 * n) for n in range(0, 10)),
+        "c,a,b\n" + "".join("{},{},y\n".format(2 * n, n) for n in range(10, 20)),
+        "".join("{},x,{}\n".format(n, 2 * n) for n in range(20, 30))
+    ]
+
+    expected_features = [
+        (ShardModel.Input(n, 'y' if 10 <= n < 20 else 'x'), ShardModel.Output(2 * n))
+        for n in range(30)
+    ]
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.paths = []
+
+        for i, contents in enumerate(self.shard_contents):
+            shard_path = path.join(self.directory.name, 'shard_{}.csv'.format(i))
+
+            with open(shard_path, 'w', encoding='utf-8') as shard_file:
+                shard_file.write(contents)
+
+            self.paths.append(shard_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_path_list(self):
+        self.assertEqual(list(ShardModel.features_from_csv(self.paths)), self.expected_features)
+
+    def test_glob(self):
+        self.assertEqual(
+            list(ShardModel.features_from_csv(path.join(self.directory.name, 'shard_*.csv'))),
+            self.expected_features
+        )
+
+    def test_pipe(self):
+        fifo_path = path.join(self.directory.name, 'pipe.csv')
+        mkfifo(fifo_path)
+
+        def write_pipe():
+            with open(fifo_path, 'w', encoding='utf-8') as fifo_file:
+                fifo_file.write(self.shard_contents[0])
+
+        writer = Thread(target=write_pipe)
+        writer.start()
+
+        try:
+            # Pipes may only be read once, without seeking
+            self.assertEqual(list(ShardModel.features_from_csv(fifo_path)), self.expected_features[:10])
+        finally:
+            writer.join()
+
+    def test_byte_range_splits(self):
+        for split_bytes in (1, 7, 20, 1000):
+            with self.subTest(split_bytes=split_bytes):
+                self.assertEqual(
+                    list(ShardModel.features_from_csv(self.paths, split_bytes=split_bytes)),
+                    self.expected_features
+                )
+
+    def test_input_features(self):
+        self.assertEqual(
+            list(ShardModel.input_features_from_csv(self.paths[2:], split_bytes=20)),
+            [input_ for input_, output in self.expected_features[20:]]
+        )
+
+    def test_workers(self):
+        with self.subTest(preserve_order=True):
+            features = list(ShardModel.features_from_csv(self.paths, workers=2, split_bytes=20))
+
+            self.assertEqual(features, self.expected_features)
+            self.assertIsInstance(features[0][0], ShardModel.Input)
+            self.assertIsInstance(features[0][1], ShardModel.Output)
+
+        with self.subTest(preserve_order=False):
+            features = list(ShardModel.features_from_csv(self.paths, workers=2, preserve_order=False, split_bytes=20))
+
+            self.assertEqual(sorted(features), self.expected_features)
+
+        with self.subTest(input_only=True):
+            self.assertEqual(
+                list(ShardModel.input_features_from_csv(self.paths[2:], workers=2)),
+                [input_ for input_, output in self.expected_features[20:]]
+            )
+
+    def test_mixed_compression(self):
+        with open(self.paths[1], 'rb') as shard_file:
+            compressed_contents = gzip.compress(shard_file.read())
+
+        with open(self.paths[1], 'wb') as shard_file:
+            shard_file.write(compressed_contents)
+
+        for workers in (None, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(
+                    list(ShardModel.features_from_csv(self.paths, workers=workers, split_bytes=20)),
+                    self.expected_features
+                )
@@ -0,0 +1,123 @@
+from concurrent.futures import ProcessPoolExecutor
+from pickle import dumps as pickle_dumps, loads as pickle_loads
+from unittest import TestCase
+from unittest.mock import patch
+
+from numpy import allclose
+from sklearn import ensemble
+
+from examples.trivial_model import TrivialModel
+from smart_fruit import Model
+from smart_fruit.feature_types import Label, Number, Optional
+
+
+class ServedModel(Model):
+    class Input:
+        a = Number(scale='standard')
+        b = Optional(Number(), impute='median')
+
+    class Output:
+        c = Number()
+        d = Label(['x', 'y'])
+
+
+class ForestModel(ServedModel):
+    model_class = ensemble.RandomForestRegressor
+
+
+def _attached_predictions(name, inputs):
+    model = ServedModel.attach(name)
+
+    return [tuple(output) for output in model.predict(ServedModel.Input(*input_) for input_ in inputs)]
+
+
+class TestSharedModel(TestCase):
+    samples = [(n, n % 3 or None, 2 * n - (n % 3 or 1), 'xy'[n % 2]) for n in range(20)]
+
+    def setUp(self):
+        self.features = list(ServedModel.features_from_list(self.samples))
+        self.inputs = [input_ for input_, output in self.features]
+
+    def test_attach(self):
+        for model_class in (ServedModel, ForestModel):
+            with self.subTest(model_class=model_class.__name__):
+                model = model_class.train(self.features, random_state=0)
+
+                with model.share() as shared_model:
+                    attached_model = model_class.attach(shared_model.name)
+
+                    self.assertIsInstance(attached_model, model_class)
+                    self.assertEqual(list(attached_model.predict(self.inputs)), list(model.predict(self.inputs)))
+
+                    del attached_model
+
+    def test_read_only(self):
+        model = ServedModel.train(self.features)
+
+        with model.share() as shared_model:
+            attached_model = ServedModel.attach(shared_model.name)
+
+            self.assertFalse(attached_model.model.coef_.flags.writeable)
+            self.assertFalse(attached_model.model.coef_.flags.owndata)
+
+            # Models are copied out of shared memory when pickled
+            copied_model = pickle_loads(pickle_dumps(attached_model))
+
+            self.assertIsNone(copied_model.shared_model)
+            self.assertTrue(allclose(copied_model.model.coef_, model.model.coef_))
+
+            del attached_model
+
+    def test_copied_trees(self):
+        model = ForestModel.train(self.features, random_state=0)
+
+        with model.share() as shared_model:
+            attached_model = ForestModel.attach(shared_model.name)
+
+            # Trees copy their node arrays out of shared memory when unpickled
+            self.assertTrue(attached_model.model.estimators_[0].tree_.value.flags.writeable)
+
+            del attached_model
+
+    def test_python_version(self):
+        model = ServedModel.train(self.features)
+
+        with patch('smart_fruit.shared_model.version_info', (3, 7)), \
+             patch('smart_fruit.shared_model.pickle_dumps') as pickle_dumps_:
+            with self.assertRaisesRegex(ImportError, 'Python 3.8'):
+                model.share()
+
+            with self.assertRaisesRegex(ImportError, 'Python 3.8'):
+                ServedModel.attach('smart_fruit_test_python_version')
+
+            pickle_dumps_.assert_not_called()
+
+    def test_worker_processes(self):
+        model = ServedModel.train(self.features)
+        inputs = [tuple(input_) for input_ in self.inputs]
+
+        with model.share() as shared_model, ProcessPoolExecutor(2) as executor:
+            predictions = list(executor.map(_attached_predictions, [shared_model.name] * 2, [inputs] * 2))
+
+        expected_predictions = [tuple(output) for output in model.predict(self.inputs)]
+
+        self.assertEqual(predictions, [expected_predictions] * 2)
+
+    def test_named(self):
+        model = ServedModel.train(self.features)
+
+        with model.share('smart_fruit_test_named') as shared_model:
+            self.assertEqual(shared_model.name, 'smart_fruit_test_named')
+
+            with self.assertRaises(FileExistsError):
+                model.share('smart_fruit_test_named')
+
+        with self.assertRaises(FileNotFoundError):
+            ServedModel.attach('smart_fruit_test_named')
+
+    def test_wrong_model_class(self):
+        model = ServedModel.train(self.features)
+
+        with model.share() as shared_model:
+            with self.assertRaises(TypeError):
+                TrivialModel.attach(shared_model.name)
@@ -165,6 +165,31 @@ class TestSimpleTypes(TestCase):
             with self.subTest(sample=sample_input):
                 self.assertAlmostEqual(prediction.c, sample_input[0])
 
+    def test_tag_input_passed_through(self):
+        class UnencodableTag(Tag):
+            def to_array(self, values):
+                raise AssertionError("Tag values should not be encoded")
+
+        class ExampleModel(Model):
+            class Input:
+                a = Number()
+                b = UnencodableTag()
+
+            class Output:
+                c = Number()
+
+        model = ExampleModel.train(ExampleModel.features_from_list([
+            (0, 0, 0),
+            (1, 1, 1)
+        ]))
+
+        inputs = [ExampleModel.Input(n, object()) for n in (0, 1)]
+
+        for sample_input, (input_, output) in zip(inputs, model.predict(inputs, yield_inputs=True)):
+            with self.subTest(sample=sample_input):
+                self.assertIs(input_, sample_input)
+                self.assertAlmostEqual(output.c, sample_input.a)
+
     def test_tag_output(self):
         class ExampleModel(Model):
             class Input:
@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+from threading import Barrier
+from unittest import TestCase
+
+from smart_fruit import Model
+from smart_fruit.feature_types import Label, Number, Vector
+from smart_fruit.utils import chunks
+
+
+class ThreadedModel(Model):
+    class Input:
+        a = Number(scale='standard')
+        b = Label(['x', 'y', 'z'])
+        c = Vector([Number(), Label(['u', 'v'])])
+
+    class Output:
+        d = Number()
+        e = Label(['p', 'q'])
+
+
+class TestThreadSafety(TestCase):
+    samples = [
+        (a, 'xyz'[a % 3], (a / 2, 'uv'[a % 2]), 3 * a - (a % 3), 'pq'[a % 2])
+        for a in range(30)
+    ]
+
+    def setUp(self):
+        self.model = ThreadedModel.train(ThreadedModel.features_from_list(self.samples))
+        self.inputs = [
+            input_
+            for input_, output in ThreadedModel.features_from_list(self.samples)
+        ]
+        self.expected_predictions = list(self.model.predict(self.inputs))
+
+    def test_index_set_on_class_creation(self):
+        class ExampleModel(Model):
+            class Input:
+                a = Number()
+                b = Number()
+
+            class Output:
+                c = Number()
+
+        self.assertEqual(ExampleModel.Input.a._index, 0)
+        self.assertEqual(ExampleModel.Input.b._index, 1)
+        self.assertEqual(ExampleModel.Input(1, 2).b, 2)
+
+    def test_shared_feature_type(self):
+        shared = Number()
+
+        class ExampleModel(Model):
+            class Input:
+                a = Number()
+                b = shared
+
+            class Output:
+                c = shared
+
+        self.assertEqual(ExampleModel.Input(1, 2).b, 2)
+        self.assertEqual(ExampleModel.Output(3).c, 3)
+
+    def test_concurrent_predict(self):
+        thread_count = 8
+        barrier = Barrier(thread_count)
+
+        def predict(_):
+            # Start all threads predicting at once
+            barrier.wait()
+
+            return [list(self.model.predict(self.inputs)) for _ in range(10)]
+
+        with ThreadPoolExecutor(thread_count) as executor:
+            for thread_predictions in executor.map(predict, range(thread_count)):
+                for predictions in thread_predictions:
+                    self.assertEqual(predictions, self.expected_predictions)
+
+    def test_concurrent_cached_predict(self):
+        self.model.cache_predictions(max_size=10)
+
+        with ThreadPoolExecutor(8) as executor:
+            for predictions in executor.map(lambda _: list(self.model.predict(self.inputs)), range(50)):
+                self.assertEqual(predictions, self.expected_predictions)
+
+    def test_predict_threaded(self):
+        for batch_size in (1, 7, 100):
+            with self.subTest(batch_size=batch_size):
+                # Compared with the same batches predicted in order, as rounding may depend on the batch size
+                expected_predictions = [
+                    prediction
+                    for batch in chunks(self.inputs, batch_size)
+                    for prediction in self.model.predict(batch)
+                ]
+
+                self.assertEqual(
+                    list(self.model.predict_threaded(iter(self.inputs), threads=4, batch_size=batch_size)),
+                    expected_predictions
+                )
+
+    def test_predict_threaded_lazily(self):
+        inputs_read = []
+
+        def inputs():
+            for input_ in cycle(self.inputs):
+                inputs_read.append(input_)
+                yield input_
+
+        predictions = self.model.predict_threaded(inputs(), threads=2, batch_size=5)
+
+        self.assertEqual(list(islice(predictions, 3)), list(self.model.predict(self.inputs[:5]))[:3])
+        predictions.close()
+
+        # Twice as many batches as threads, and one more once the first is yielded, are read from an endless stream
+        self.assertLessEqual(len(inputs_read), 25)
@@ -1,4 +1,6 @@
+from pickle import dumps, loads
 from unittest import TestCase
+from unittest.mock import patch
 
 from examples.trivial_model import TrivialModel
 
@@ -40,3 +42,15 @@ class TestTrivialModel(TestCase):
                 # Check that it's not exact, but still in the ballpark
                 self.assertNotAlmostEqual(prediction.output, n ** 2, places=0)
                 self.assertAlmostEqual(prediction.output, n ** 2, places=-3)
+
+    def test_unpickle_earlier_versions(self):
+        model = TrivialModel.train(TrivialModel.features_from_list((n, 10 * n) for n in range(20)))
+        features = list(TrivialModel.features_from_list([(3, 30), (5, 50)]))
+
+        # Earlier versions only pickled the underlying model
+        with patch.object(TrivialModel, '__getstate__', lambda self: {'model': self.model}):
+            earlier_model = loads(dumps(model))
+
+        self.assertIsNone(earlier_model.prediction_cache)
+        self.assertAlmostEqual(list(earlier_model.predict(input_ for input_, output in features))[0].output, 30)
+        self.assertAlmostEqual(earlier_model.score(features), 1)
@@ -1,7 +1,12 @@
-from io import StringIO
+import bz2
+import gzip
+import lzma
+from io import BytesIO, StringIO
+from os import path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
-from smart_fruit.utils import csv_open
+from smart_fruit.utils import csv_open, csv_paths, csv_read_shard, csv_shards, open_decompressed
 
 
 class TestCSVOpen(TestCase):
@@ -41,3 +46,116 @@ class TestCSVOpen(TestCase):
     def test_missing_columns(self):
         with self.assertRaises(IndexError):
             list(csv_open(StringIO("1,2"), self.test_csv_columns))
+
+    def test_required_columns(self):
+        self.assertEqual(
+            list(csv_open(StringIO("1,2,3\n4,5"), self.test_csv_columns, required_columns={'a', 'b'})),
+            [{'a': '1', 'b': '2', 'c': '3'}, {'a': '4', 'b': '5'}]
+        )
+
+        with self.assertRaises(IndexError):
+            list(csv_open(StringIO("1,2,3\n4"), self.test_csv_columns, required_columns={'a', 'b'}))
+
+
+class TestCSVShards(TestCase):
+    test_csv_path = "tests/test_utils/example_csv.csv"
+    test_csv_columns = ('a', 'b', 'c')
+
+    def test_shards_cover_file(self):
+        for split_bytes in (None, 1, 4, 100):
+            with self.subTest(split_bytes=split_bytes):
+                shards = list(csv_shards([self.test_csv_path], self.test_csv_columns, split_bytes=split_bytes))
+
+                self.assertEqual(
+                    [row for shard in shards for row in csv_read_shard(*shard)],
+                    list(csv_open(self.test_csv_path, self.test_csv_columns))
+                )
+
+                ends = [end for path, start, end, columns in shards]
+                starts = [start for path, start, end, columns in shards]
+
+                self.assertEqual(ends[:-1], starts[1:])
+
+    def test_csv_paths(self):
+        self.assertEqual(csv_paths(self.test_csv_path), [self.test_csv_path])
+        self.assertEqual(csv_paths("tests/test_utils/*.csv"), [self.test_csv_path])
+        self.assertEqual(csv_paths([self.test_csv_path, self.test_csv_path]), [self.test_csv_path] * 2)
+
+
+class TestCompressedCSV(TestCase):
+    test_csv_path = "tests/test_utils/example_csv.csv"
+    test_csv_columns = ('a', 'b', 'c')
+
+    compressors = {
+        'gzip': gzip.compress,
+        'bz2': bz2.compress,
+        'xz': lzma.compress
+    }
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+        with open(self.test_csv_path, 'rb') as csv_file:
+            self.csv_bytes = csv_file.read()
+
+        self.expected_rows = list(csv_open(self.test_csv_path, self.test_csv_columns))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _compressed_path(self, compression):
+        compressed_path = path.join(self.directory.name, 'example_csv.csv.{}'.format(compression))
+
+        with open(compressed_path, 'wb') as compressed_file:
+            compressed_file.write(self.compressors[compression](self.csv_bytes))
+
+        return compressed_path
+
+    def test_open_decompressed(self):
+        for compression in self.compressors:
+            with self.subTest(compression=compression):
+                with open_decompressed(self._compressed_path(compression)) as decompressed_file:
+                    self.assertEqual(decompressed_file.read(), self.csv_bytes)
+
+    def test_opens_compressed_paths(self):
+        for compression in self.compressors:
+            with self.subTest(compression=compression):
+                self.assertEqual(
+                    list(csv_open(self._compressed_path(compression), self.test_csv_columns)),
+                    self.expected_rows
+                )
+
+    def test_opens_compressed_file_handles(self):
+        for compression in self.compressors:
+            with self.subTest(compression=compression):
+                compressed_file = BytesIO(self.compressors[compression](self.csv_bytes))
+
+                self.assertEqual(list(csv_open(compressed_file, self.test_csv_columns)), self.expected_rows)
+                self.assertFalse(compressed_file.closed)
+
+    def test_leaves_file_handles_open(self):
+        for csv_file in (BytesIO(self.csv_bytes), BytesIO(gzip.compress(self.csv_bytes))):
+            with self.subTest(csv_file=csv_file):
+                # Stop reading part way through, as well as at the end
+                rows = csv_open(csv_file, self.test_csv_columns)
+                next(rows)
+                rows.close()
+
+                self.assertFalse(csv_file.closed)
+
+                csv_file.seek(0)
+                self.assertEqual(list(csv_open(csv_file, self.test_csv_columns)), self.expected_rows)
+                self.assertFalse(csv_file.closed)
+
+        with open(self.test_csv_path, 'rb') as csv_file:
+            self.assertEqual(list(csv_open(csv_file, self.test_csv_columns)), self.expected_rows)
+            self.assertFalse(csv_file.closed)
+
+    def test_compressed_files_not_split(self):
+        for compression in self.compressors:
+            with self.subTest(compression=compression):
+                shards = list(csv_shards([self._compressed_path(compression)], self.test_csv_columns, split_bytes=1))
+
+                self.assertEqual(len(shards), 1)
+                self.assertIsNone(shards[0][2])
+                self.assertEqual(list(csv_read_shard(*shards[0])), self.expected_rows)